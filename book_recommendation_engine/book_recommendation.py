@@ -11,7 +11,15 @@ from sklearn.preprocessing import StandardScaler, MultiLabelBinarizer
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import ast
+import json
+import os
 import re
+import tempfile
+import warnings
+
+
+# Single-quoted items inside a list literal such as "['Harper Lee', 'Fiction']"
+LIST_ITEM_PATTERN = re.compile(r"'([^']*)'")
 
 
 class BookRecommender:
@@ -19,23 +27,65 @@ class BookRecommender:
     A book recommendation system using KNN and content-based filtering.
     """
 
-    def __init__(self):
+    NUMERICAL_COLUMNS = [
+        'average_rating', 'num_pages', 'ratings_count',
+        'text_reviews_count', 'publication_year'
+    ]
+
+    # Short names accepted by get_similar_books_by_features()
+    FEATURE_ALIASES = {
+        'rating': 'average_rating',
+        'pages': 'num_pages',
+        'year': 'publication_year'
+    }
+
+    # Parquet schema metadata key holding the signature of the source CSV
+    CACHE_SOURCE_KEY = b'source_csv'
+
+    def __init__(self, rebuild_threshold=0.2):
+        """
+        Initialize the recommender.
+
+        Args:
+            rebuild_threshold (float): Fraction of the catalogue that may change
+                through add_books()/remove_books() before the encoders are refit
+        """
         self.books_df = None
         self.feature_matrix = None
         self.knn_model = None
         self.scaler = StandardScaler()
         self.tfidf_vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
         self.mlb_genres = MultiLabelBinarizer()
+        self.rebuild_threshold = rebuild_threshold
+        self._fill_values = {}
+        self._knn_params = {'n_neighbors': 5, 'algorithm': 'auto'}
+        self._rows_at_fit = 0
+        self._rows_changed = 0
 
-    def load_data(self, filepath):
+    def load_data(self, filepath, use_cache=True):
         """
         Load book data from CSV file.
 
+        The parsed author and genre lists are cached next to the CSV as a
+        Parquet file, so later loads of an unchanged CSV skip parsing.
+
         Args:
             filepath (str): Path to the CSV file containing book data
+            use_cache (bool): Read and write the parsed Parquet cache
         """
         try:
-            self.books_df = pd.read_csv(filepath)
+            cache_path = os.path.splitext(filepath)[0] + '.parsed.parquet'
+            # Taken before reading, so a CSV rewritten mid-load is not cached as current
+            source = self._source_signature(filepath)
+            cached = self._read_parsed_cache(source, cache_path) if use_cache else None
+
+            if cached is not None:
+                self.books_df = cached
+            else:
+                self.books_df = pd.read_csv(filepath)
+                self._parse_list_columns(self.books_df)
+                if use_cache:
+                    self._write_parsed_cache(source, cache_path)
 
             # Clean and preprocess data
             self._preprocess_data()
@@ -46,6 +96,97 @@ class BookRecommender:
             print(f"File {filepath} not found. Using sample data instead.")
             self._create_sample_data()
 
+    @staticmethod
+    def _source_signature(filepath):
+        """
+        Describe the CSV file a parsed cache was built from.
+
+        Args:
+            filepath (str): Path to the source CSV file
+
+        Returns:
+            dict: Size in bytes and modification time in nanoseconds
+        """
+        stat = os.stat(filepath)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def _read_parsed_cache(self, source, cache_path):
+        """
+        Read the parsed Parquet cache if it was built from the current CSV.
+
+        Args:
+            source (dict): Signature of the source CSV from _source_signature()
+            cache_path (str): Path to the Parquet cache
+
+        Returns:
+            pd.DataFrame: Cached book rows, or None if the cache is missing,
+                stale or unreadable
+        """
+        if not os.path.exists(cache_path):
+            return None
+
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            return None
+
+        # A damaged cache only costs a re-parse of the CSV
+        try:
+            metadata = pq.read_schema(cache_path).metadata or {}
+            if json.loads(metadata.get(self.CACHE_SOURCE_KEY, b'null')) != source:
+                return None
+
+            # Convert the Arrow list columns straight to Python lists
+            list_columns = ['authors_list', 'genres_list']
+            table = pq.read_table(cache_path)
+            df = table.drop_columns(list_columns).to_pandas()
+            for col in list_columns:
+                df[col] = table.column(col).to_pylist()
+        except (pa.ArrowException, OSError, KeyError, ValueError) as e:
+            warnings.warn(f"Ignoring unreadable parsed cache {cache_path}: {e}")
+            return None
+
+        print(f"Using parsed cache {cache_path}")
+        return df
+
+    def _write_parsed_cache(self, source, cache_path):
+        """
+        Write the raw book rows and their parsed lists to a Parquet cache.
+
+        The file is written next to the cache and renamed over it, so readers
+        never see a partial cache.
+
+        Args:
+            source (dict): Signature of the source CSV from _source_signature()
+            cache_path (str): Path to the Parquet cache
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("pyarrow is not installed, skipping the parsed cache")
+            return
+
+        table = pa.Table.from_pandas(self.books_df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[self.CACHE_SOURCE_KEY] = json.dumps(source).encode()
+        table = table.replace_schema_metadata(metadata)
+
+        # The cache only saves parsing time, so a failed write must not break loading
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cache_path)),
+                                        suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pq.write_table(table, f)
+            os.replace(tmp_path, cache_path)
+        except (pa.ArrowException, OSError) as e:
+            warnings.warn(f"Could not write the parsed cache {cache_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
     def _create_sample_data(self):
         """
         Create sample book data for demonstration.
@@ -130,18 +271,72 @@ class BookRecommender:
         """
         Preprocess the book data for recommendation system.
         """
+        # Remember the fill values so rows added later are treated the same way
+        self._fill_values = {
+            'num_pages': self.books_df['num_pages'].median(),
+            'average_rating': self.books_df['average_rating'].mean()
+        }
+
+        self.books_df = self._preprocess_frame(self.books_df)
+
+    def _preprocess_frame(self, df):
+        """
+        Apply the preprocessing steps to a dataframe of raw book rows.
+
+        Args:
+            df (pd.DataFrame): Raw book rows
+
+        Returns:
+            pd.DataFrame: Preprocessed book rows
+        """
         # Parse authors and genres from string representations
-        self.books_df['authors_list'] = self.books_df['authors'].apply(self._parse_list_string)
-        self.books_df['genres_list'] = self.books_df['genres'].apply(self._parse_list_string)
+        if 'authors_list' not in df or 'genres_list' not in df:
+            self._parse_list_columns(df)
 
         # Extract publication year
-        self.books_df['publication_year'] = pd.to_datetime(
-            self.books_df['publication_date'], errors='coerce'
+        df['publication_year'] = pd.to_datetime(
+            df['publication_date'], errors='coerce'
         ).dt.year.fillna(2000).astype(int)
 
         # Fill missing values
-        self.books_df['num_pages'] = self.books_df['num_pages'].fillna(self.books_df['num_pages'].median())
-        self.books_df['average_rating'] = self.books_df['average_rating'].fillna(self.books_df['average_rating'].mean())
+        df['num_pages'] = df['num_pages'].fillna(self._fill_values['num_pages'])
+        df['average_rating'] = df['average_rating'].fillna(self._fill_values['average_rating'])
+
+        return df
+
+    def _parse_list_columns(self, df):
+        """
+        Parse the authors and genres columns into list columns.
+
+        Args:
+            df (pd.DataFrame): Book rows with 'authors' and 'genres' columns
+        """
+        df['authors_list'] = self._parse_list_series(df['authors'])
+        df['genres_list'] = self._parse_list_series(df['genres'])
+
+    def _parse_list_series(self, series):
+        """
+        Parse a column of list strings in one vectorised pass.
+
+        The common case, items in single quotes, is handled by a single
+        str.findall() over the column. Rows containing double quotes or
+        backslashes are left to _parse_list_string() so the result matches
+        ast.literal_eval.
+
+        Args:
+            series (pd.Series): Strings like "['item1', 'item2']"
+
+        Returns:
+            pd.Series: Parsed lists
+        """
+        values = series.fillna('').astype(str)
+        special = values.str.contains(r'["\\]')
+
+        lists = values.str.findall(LIST_ITEM_PATTERN)
+        if special.any():
+            lists[special] = values[special].apply(self._parse_list_string)
+
+        return lists
 
     def _parse_list_string(self, list_string):
         """
@@ -168,10 +363,7 @@ class BookRecommender:
             raise ValueError("No book data loaded. Call load_data() first.")
 
         # Create numerical features
-        numerical_features = self.books_df[[
-            'average_rating', 'num_pages', 'ratings_count',
-            'text_reviews_count', 'publication_year'
-        ]].copy()
+        numerical_features = self.books_df[self.NUMERICAL_COLUMNS].copy()
 
         # Scale numerical features
         numerical_scaled = self.scaler.fit_transform(numerical_features)
@@ -190,8 +382,120 @@ class BookRecommender:
             authors_tfidf
         ])
 
+        self._rows_at_fit = len(self.books_df)
+        self._rows_changed = 0
+
         print(f"Feature matrix shape: {self.feature_matrix.shape}")
 
+    def _transform_features(self, df):
+        """
+        Transform preprocessed book rows with the already fitted encoders.
+
+        Genres and author names that were not seen when the encoders were
+        fit are dropped, just as they would be for any unseen vocabulary.
+
+        Args:
+            df (pd.DataFrame): Preprocessed book rows
+
+        Returns:
+            numpy.ndarray: Feature rows in the fitted feature space
+        """
+        numerical_scaled = self.scaler.transform(df[self.NUMERICAL_COLUMNS])
+
+        # MultiLabelBinarizer warns about unknown genres; they are ignored
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            genres_encoded = self.mlb_genres.transform(df['genres_list'])
+
+        authors_text = df['authors_list'].apply(lambda x: ' '.join(x))
+        authors_tfidf = self.tfidf_vectorizer.transform(authors_text).toarray()
+
+        return np.hstack([
+            numerical_scaled,
+            genres_encoded,
+            authors_tfidf
+        ])
+
+    def catalogue_drift(self):
+        """
+        Fraction of the catalogue added or removed since the last full fit.
+
+        Returns:
+            float: Changed rows divided by the number of rows at fit time
+        """
+        return self._rows_changed / max(self._rows_at_fit, 1)
+
+    def add_books(self, df):
+        """
+        Add books to the catalogue without refitting the encoders.
+
+        New rows are transformed with the fitted scaler, genre binarizer and
+        author vectorizer and appended to the feature matrix and KNN index.
+        Once the catalogue drift passes rebuild_threshold, everything is
+        rebuilt from scratch.
+
+        Args:
+            df (pd.DataFrame): Raw book rows with the same columns as load_data()
+        """
+        if self.books_df is None:
+            raise ValueError("No book data loaded. Call load_data() first.")
+
+        new_books = self._preprocess_frame(df.copy())
+        self.books_df = pd.concat([self.books_df, new_books], ignore_index=True)
+
+        if self.feature_matrix is None:
+            print(f"Added {len(new_books)} books")
+            return
+
+        self.feature_matrix = np.vstack([
+            self.feature_matrix,
+            self._transform_features(new_books)
+        ])
+        self._rows_changed += len(new_books)
+        self._refresh_index()
+
+        print(f"Added {len(new_books)} books (drift {self.catalogue_drift():.1%})")
+
+    def remove_books(self, ids, id_column='isbn13'):
+        """
+        Remove books from the catalogue without refitting the encoders.
+
+        Args:
+            ids: Iterable of identifiers to remove
+            id_column (str): Column the identifiers refer to
+        """
+        if self.books_df is None:
+            raise ValueError("No book data loaded. Call load_data() first.")
+
+        keep = ~self.books_df[id_column].isin(list(ids)).to_numpy()
+        n_removed = int((~keep).sum())
+        if n_removed == 0:
+            return
+
+        self.books_df = self.books_df[keep].reset_index(drop=True)
+
+        if self.feature_matrix is None:
+            print(f"Removed {n_removed} books")
+            return
+
+        self.feature_matrix = self.feature_matrix[keep]
+        self._rows_changed += n_removed
+        self._refresh_index()
+
+        print(f"Removed {n_removed} books (drift {self.catalogue_drift():.1%})")
+
+    def _refresh_index(self):
+        """
+        Bring the KNN index in line with the feature matrix, rebuilding the
+        encoders as well when the catalogue has drifted too far.
+        """
+        if self.catalogue_drift() > self.rebuild_threshold:
+            print("Catalogue drift above threshold, rebuilding features")
+            self.build_feature_matrix()
+
+        if self.knn_model is not None:
+            self.train_model(**self._knn_params)
+
     def train_model(self, n_neighbors=5, algorithm='auto'):
         """
         Train the KNN model.
@@ -203,6 +507,8 @@ class BookRecommender:
         if self.feature_matrix is None:
             self.build_feature_matrix()
 
+        self._knn_params = {'n_neighbors': n_neighbors, 'algorithm': algorithm}
+
         self.knn_model = NearestNeighbors(
             n_neighbors=n_neighbors + 1,  # +1 to exclude the book itself
             algorithm=algorithm,
@@ -225,6 +531,27 @@ class BookRecommender:
         if self.knn_model is None:
             raise ValueError("Model not trained. Call train_model() first.")
 
+        book_idx = self._find_book_index(book_title)
+
+        # Get recommendations
+        distances, indices = self.knn_model.kneighbors(
+            [self.feature_matrix[book_idx]],
+            n_neighbors=n_recommendations + 1
+        )
+
+        # Remove the book itself from recommendations
+        return self._format_recommendations(distances[0][1:], indices[0][1:])
+
+    def _find_book_index(self, book_title):
+        """
+        Find the row position of a book by (partial) title.
+
+        Args:
+            book_title (str): Title of the book
+
+        Returns:
+            int: Row position of the first matching book
+        """
         # Find the book index
         book_indices = self.books_df[self.books_df['title'].str.lower().str.contains(
             book_title.lower(), na=False
@@ -237,48 +564,161 @@ class BookRecommender:
         if len(book_indices) == 0:
             raise ValueError(f"Book '{book_title}' not found in database")
 
-        book_idx = book_indices[0]
+        return book_indices[0]
 
-        # Get recommendations
-        distances, indices = self.knn_model.kneighbors(
-            [self.feature_matrix[book_idx]],
-            n_neighbors=n_recommendations + 1
-        )
+    def get_hybrid_recommendations(self, book_title, collaborative, n_recommendations=5,
+                                   alpha=0.5, id_column='isbn13'):
+        """
+        Blend content similarity with collaborative filtering similarity.
 
-        # Remove the book itself from recommendations
-        recommended_indices = indices[0][1:]  # Skip first (itself)
+        Each catalogue book is scored with
+        alpha * content similarity + (1 - alpha) * rating similarity,
+        where books without ratings get a rating similarity of zero.
+
+        Args:
+            book_title (str): Title of the book to base recommendations on
+            collaborative (CollaborativeFilter): Fitted collaborative filter
+            n_recommendations (int): Number of recommendations to return
+            alpha (float): Weight of the content similarity
+            id_column (str): Catalogue column matching the ratings book ids
+
+        Returns:
+            list: List of recommended book dictionaries
+        """
+        if self.feature_matrix is None:
+            raise ValueError("No features built. Call build_feature_matrix() first.")
+
+        book_idx = self._find_book_index(book_title)
+
+        # Content similarity against the whole catalogue
+        content_scores = cosine_similarity(
+            self.feature_matrix[book_idx:book_idx + 1], self.feature_matrix
+        )[0]
+
+        # Rating similarity, aligned to the catalogue rows
+        catalogue_ids = self.books_df[id_column].astype(str)
+        positions = collaborative.book_ids.get_indexer(catalogue_ids)
+        rating_scores = np.zeros(len(self.books_df))
+        try:
+            similarities = collaborative.item_similarities(catalogue_ids.iloc[book_idx])
+            rated = positions != -1
+            rating_scores[rated] = similarities[positions[rated]]
+        except ValueError:
+            pass  # The book has no ratings, fall back to content only
+
+        scores = alpha * content_scores + (1 - alpha) * rating_scores
 
+        # Rank every book except the queried one
+        candidates = np.delete(np.arange(len(scores)), book_idx)
+        n = min(n_recommendations, len(candidates))
+        top = candidates[np.argsort(-scores[candidates], kind='stable')[:n]]
+
+        recommendations = self._format_recommendations(np.zeros(len(top)), top)
+        for rec, idx in zip(recommendations, top):
+            rec['similarity_score'] = scores[idx]  # The blended score
+            rec['content_score'] = content_scores[idx]
+            rec['rating_score'] = rating_scores[idx]
+
+        return recommendations
+
+    def _format_recommendations(self, distances, indices):
+        """
+        Turn one row of KNN results into recommendation dictionaries.
+
+        Args:
+            distances (numpy.ndarray): Cosine distances to the neighbours
+            indices (numpy.ndarray): Row positions of the neighbours
+
+        Returns:
+            list: List of recommended books
+        """
         recommendations = []
-        for idx in recommended_indices:
+        for distance, idx in zip(distances, indices):
             book_info = self.books_df.iloc[idx]
             recommendations.append({
                 'title': book_info['title'],
                 'authors': book_info['authors_list'],
                 'average_rating': book_info['average_rating'],
                 'genres': book_info['genres_list'],
-                'similarity_score': 1 - distances[0][indices[0].tolist().index(idx)]  # Convert distance to similarity
+                'similarity_score': 1 - distance  # Convert distance to similarity
             })
 
         return recommendations
 
+    def _features_to_frame(self, target_features):
+        """
+        Build preprocessed book rows from feature dictionaries.
+
+        Numerical features that are not given default to the fitted scaler
+        mean, so they do not pull the query in any direction.
+
+        Args:
+            target_features (list): Dictionaries with keys such as 'rating',
+                'pages', 'year', 'genres' and 'authors'
+
+        Returns:
+            pd.DataFrame: One preprocessed row per dictionary
+        """
+        defaults = dict(zip(self.NUMERICAL_COLUMNS, self.scaler.mean_))
+
+        rows = []
+        for features in target_features:
+            row = dict(defaults)
+            row['authors_list'] = []
+            row['genres_list'] = []
+
+            for key, value in features.items():
+                key = self.FEATURE_ALIASES.get(key, key)
+                if key in ('authors', 'genres'):
+                    if isinstance(value, str):
+                        value = self._parse_list_string(value) if value.startswith('[') else [value]
+                    row[f'{key}_list'] = list(value)
+                elif key in defaults:
+                    row[key] = value
+                else:
+                    raise ValueError(f"Unknown feature '{key}'")
+
+            rows.append(row)
+
+        return pd.DataFrame(rows)
+
     def get_similar_books_by_features(self, target_features, n_recommendations=5):
         """
         Get recommendations based on specific features.
 
+        The features are transformed with the fitted scaler, genre binarizer
+        and author vectorizer and queried against the same KNN index as
+        get_recommendations(), which makes it usable for books that are not
+        in the catalogue.
+
         Args:
-            target_features (dict): Dictionary of target features
+            target_features (dict or list): Dictionary of target features, or
+                a list of them to query in one batch
             n_recommendations (int): Number of recommendations
 
         Returns:
-            list: List of recommended books
+            list: List of recommended books, or one such list per dictionary
+                when a list was given
         """
-        # This is a simplified version - in practice, you'd need to transform
-        # the target features into the same feature space
-        return self.get_recommendations(
-            list(self.books_df['title'])[0],  # Use first book as example
-            n_recommendations
+        if self.knn_model is None:
+            raise ValueError("Model not trained. Call train_model() first.")
+
+        batched = not isinstance(target_features, dict)
+        queries = list(target_features) if batched else [target_features]
+
+        query_matrix = self._transform_features(self._features_to_frame(queries))
+        distances, indices = self.knn_model.kneighbors(
+            query_matrix,
+            n_neighbors=n_recommendations
         )
 
+        results = [
+            self._format_recommendations(row_distances, row_indices)
+            for row_distances, row_indices in zip(distances, indices)
+        ]
+
+        return results if batched else results[0]
+
 
 def main():
     """
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Collaborative Filtering for the Book Recommendation Engine
+This script builds item-item recommendations from user rating logs using a
+sparse user-item matrix and a truncated SVD factorisation.
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import svds
+
+
+class CollaborativeFilter:
+    """
+    An item-item collaborative filter based on truncated SVD.
+    """
+
+    def __init__(self, n_factors=64):
+        """
+        Initialize the collaborative filter.
+
+        Args:
+            n_factors (int): Number of latent factors kept by the SVD
+        """
+        self.n_factors = n_factors
+        self.ratings_matrix = None
+        self.user_ids = pd.Index([])
+        self.book_ids = pd.Index([])
+        self.item_factors = None
+
+    def load_ratings(self, filepath, user_column='user_id', book_column='isbn13',
+                     rating_column='rating', chunksize=1_000_000):
+        """
+        Build the sparse user-item matrix from a ratings CSV in chunks.
+
+        Only the integer codes and ratings of each chunk are kept, so memory
+        grows with the number of ratings and not with the CSV text.
+
+        Args:
+            filepath (str): Path to the CSV file containing ratings
+            user_column (str): Column holding user identifiers
+            book_column (str): Column holding book identifiers
+            rating_column (str): Column holding the rating values
+            chunksize (int): Number of rows read per chunk
+        """
+        rows, cols, values = [], [], []
+
+        reader = pd.read_csv(
+            filepath,
+            usecols=[user_column, book_column, rating_column],
+            dtype={user_column: str, book_column: str, rating_column: np.float32},
+            chunksize=chunksize
+        )
+
+        for chunk in reader:
+            chunk = chunk.dropna()
+            self.user_ids, user_codes = self._encode(self.user_ids, chunk[user_column])
+            self.book_ids, book_codes = self._encode(self.book_ids, chunk[book_column])
+
+            rows.append(user_codes)
+            cols.append(book_codes)
+            values.append(chunk[rating_column].to_numpy(dtype=np.float32))
+
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        values = np.concatenate(values)
+        shape = (len(self.user_ids), len(self.book_ids))
+
+        # csr_matrix sums duplicate (user, book) pairs, so divide by their count
+        self.ratings_matrix = csr_matrix((values, (rows, cols)), shape=shape, dtype=np.float32)
+        counts = csr_matrix((np.ones_like(values), (rows, cols)), shape=shape, dtype=np.float32)
+        self.ratings_matrix.data /= counts.data
+
+        print(f"Loaded {self.ratings_matrix.nnz} ratings from "
+              f"{len(self.user_ids)} users on {len(self.book_ids)} books")
+
+    def _encode(self, known_ids, ids):
+        """
+        Map identifiers to integer codes, extending the known identifiers.
+
+        Args:
+            known_ids (pd.Index): Identifiers seen so far
+            ids (pd.Series): Identifiers to encode
+
+        Returns:
+            tuple: (updated known_ids, numpy.ndarray of int32 codes)
+        """
+        codes = known_ids.get_indexer(ids)
+        missing = codes == -1
+
+        if missing.any():
+            known_ids = known_ids.append(pd.Index(pd.unique(ids[missing])))
+            codes = known_ids.get_indexer(ids)
+
+        return known_ids, codes.astype(np.int32)
+
+    def fit(self):
+        """
+        Factorise the mean-centred ratings matrix with a truncated SVD.
+        """
+        if self.ratings_matrix is None:
+            raise ValueError("No ratings loaded. Call load_ratings() first.")
+
+        # Centre each user's ratings on their own mean
+        centred = self.ratings_matrix.copy()
+        counts = np.diff(centred.indptr)
+        user_means = np.asarray(centred.sum(axis=1)).ravel() / np.maximum(counts, 1)
+        centred.data -= np.repeat(user_means, counts).astype(np.float32)
+
+        k = min(self.n_factors, min(centred.shape) - 1)
+        _, singular_values, vt = svds(centred, k=k)
+
+        # Normalised item vectors make a dot product a cosine similarity
+        item_factors = vt.T * singular_values
+        norms = np.linalg.norm(item_factors, axis=1, keepdims=True)
+        self.item_factors = item_factors / np.maximum(norms, 1e-12)
+
+    def item_similarities(self, book_id):
+        """
+        Cosine similarity between one book and every book in the ratings.
+
+        Args:
+            book_id (str): Identifier of the book
+
+        Returns:
+            numpy.ndarray: Similarity per book, aligned with book_ids
+        """
+        if self.item_factors is None:
+            raise ValueError("Model not trained. Call fit() first.")
+
+        position = self.book_ids.get_indexer([book_id])[0]
+        if position == -1:
+            raise ValueError(f"Book '{book_id}' has no ratings")
+
+        return self.item_factors @ self.item_factors[position]
+
+    def similar_books(self, book_id, n_recommendations=5):
+        """
+        Get the books most similar to a given book by rating behaviour.
+
+        Args:
+            book_id (str): Identifier of the book
+            n_recommendations (int): Number of recommendations to return
+
+        Returns:
+            list: List of (book_id, similarity_score) tuples
+        """
+        scores = self.item_similarities(book_id)
+        position = self.book_ids.get_indexer([book_id])[0]
+        scores[position] = -np.inf
+
+        n = min(n_recommendations, len(scores) - 1)
+        top = np.argpartition(-scores, n)[:n]
+        top = top[np.argsort(-scores[top])]
+
+        return [(self.book_ids[idx], float(scores[idx])) for idx in top]
+
+
+def _write_synthetic_ratings(filepath, n_users, n_books, n_ratings, seed=42):
+    """
+    Write a synthetic ratings CSV with a power-law skew towards popular books.
+
+    Args:
+        filepath (str): Path of the CSV file to write
+        n_users (int): Number of distinct users
+        n_books (int): Number of distinct books
+        n_ratings (int): Number of rating rows
+        seed (int): Random seed
+    """
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, n_books + 1) ** 0.8
+
+    pd.DataFrame({
+        'user_id': rng.integers(0, n_users, n_ratings),
+        'isbn13': rng.choice(n_books, n_ratings, p=popularity / popularity.sum()),
+        'rating': rng.integers(1, 6, n_ratings)
+    }).to_csv(filepath, index=False)
+
+
+def benchmark(n_users=50_000, n_books=20_000, n_ratings=1_000_000, n_factors=64, n_queries=1000):
+    """
+    Benchmark loading, fitting and querying on a synthetic ratings file.
+
+    Args:
+        n_users (int): Number of distinct users
+        n_books (int): Number of distinct books
+        n_ratings (int): Number of rating rows
+        n_factors (int): Number of latent factors
+        n_queries (int): Number of similar_books() calls to time
+
+    Returns:
+        dict: Timings in seconds and query latency percentiles in milliseconds
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, 'ratings.csv')
+        _write_synthetic_ratings(filepath, n_users, n_books, n_ratings)
+
+        cf = CollaborativeFilter(n_factors=n_factors)
+
+        start = time.perf_counter()
+        cf.load_ratings(filepath, chunksize=250_000)
+        load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cf.fit()
+    fit_time = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    latencies = []
+    for book_id in rng.choice(cf.book_ids, n_queries):
+        start = time.perf_counter()
+        cf.similar_books(book_id, 10)
+        latencies.append(time.perf_counter() - start)
+
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+
+    return {
+        'load_time': load_time,
+        'fit_time': fit_time,
+        'query_p50_ms': p50,
+        'query_p95_ms': p95,
+        'query_p99_ms': p99
+    }
+
+
+def main():
+    """
+    Run the collaborative filtering benchmark on one million synthetic ratings.
+    """
+    print("Collaborative Filtering Benchmark")
+    print("=" * 50)
+
+    results = benchmark()
+
+    print(f"\nLoad time:  {results['load_time']:.2f}s")
+    print(f"Fit time:   {results['fit_time']:.2f}s")
+    print(f"Query p50:  {results['query_p50_ms']:.3f}ms")
+    print(f"Query p95:  {results['query_p95_ms']:.3f}ms")
+    print(f"Query p99:  {results['query_p99_ms']:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Book Recommendation Server
+This script keeps a trained BookRecommender in memory and serves
+recommendations over HTTP, with an LRU result cache and latency metrics.
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from book_recommendation import BookRecommender
+
+
+class BookNotFoundError(ValueError):
+    """
+    Raised when a requested title is not in the catalogue.
+    """
+
+
+class LRUCache:
+    """
+    A thread-safe, bounded least-recently-used cache.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Look up a key, marking it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop every entry, for example after the catalogue changed.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Size, hits, misses and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class LatencyTracker:
+    """
+    Keeps the most recent latency samples and reports percentiles.
+    """
+
+    def __init__(self, window=10000):
+        """
+        Initialize the tracker.
+
+        Args:
+            window (int): Number of most recent samples kept
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds):
+        """
+        Record one latency sample.
+
+        Args:
+            seconds (float): Measured latency in seconds
+        """
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def summary(self):
+        """
+        Get latency percentiles over the sample window.
+
+        Returns:
+            dict: Sample count and p50/p95/p99 in milliseconds
+        """
+        with self._lock:
+            samples = np.array(self._samples)
+
+        if len(samples) == 0:
+            return {'count': self.count, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+
+        p50, p95, p99 = np.percentile(samples * 1000, [50, 95, 99])
+        return {'count': self.count, 'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+
+
+class RecommendationService:
+    """
+    Serves recommendations from a trained BookRecommender kept in memory.
+    """
+
+    def __init__(self, recommender, cache_size=1024):
+        """
+        Initialize the service.
+
+        Args:
+            recommender (BookRecommender): Trained recommender
+            cache_size (int): Maximum number of cached (title, k) results
+        """
+        self.recommender = recommender
+        self.cache = LRUCache(cache_size)
+        self.request_latency = LatencyTracker()
+        self.index_latency = LatencyTracker()
+        self.started_at = time.time()
+
+    def recommend(self, title, k=5):
+        """
+        Get recommendations for a title, answering from the cache when possible.
+
+        Args:
+            title (str): Title of the book to base recommendations on
+            k (int): Number of recommendations, capped at the other books in the catalogue
+
+        Returns:
+            list: List of recommended books as JSON-serialisable dictionaries
+        """
+        start = time.perf_counter()
+        # Failed requests are timed too, so slow 404s and errors show up in the percentiles
+        try:
+            if k < 1:
+                raise ValueError("'k' must be at least 1")
+
+            recommender = self.recommender
+            k = min(k, len(recommender.books_df) - 1)
+            # The same normalised title keys the cache and finds the book
+            query = title.strip().lower()
+            if not query:
+                raise ValueError("'title' must not be empty")
+            key = (query, k)
+
+            result = self.cache.get(key)
+            if result is None:
+                try:
+                    book_idx = recommender._find_book_index(query)
+                except ValueError as e:
+                    raise BookNotFoundError(str(e)) from None
+
+                index_start = time.perf_counter()
+                distances, indices = recommender.knn_model.kneighbors(
+                    [recommender.feature_matrix[book_idx]],
+                    n_neighbors=k + 1
+                )
+                self.index_latency.record(time.perf_counter() - index_start)
+
+                recommendations = recommender._format_recommendations(distances[0][1:], indices[0][1:])
+                result = [self._to_json(rec) for rec in recommendations]
+                self.cache.put(key, result)
+
+            return result
+        finally:
+            self.request_latency.record(time.perf_counter() - start)
+
+    def _to_json(self, recommendation):
+        """
+        Convert numpy values in a recommendation to plain Python types.
+
+        Args:
+            recommendation (dict): Recommendation from BookRecommender
+
+        Returns:
+            dict: JSON-serialisable recommendation
+        """
+        return {
+            'title': recommendation['title'],
+            'authors': list(recommendation['authors']),
+            'average_rating': float(recommendation['average_rating']),
+            'genres': list(recommendation['genres']),
+            'similarity_score': float(recommendation['similarity_score'])
+        }
+
+    def metrics(self):
+        """
+        Get latency and cache metrics.
+
+        Returns:
+            dict: Latency of every recommend() call including failed ones,
+                index query latency and cache statistics
+        """
+        return {
+            'uptime_seconds': time.time() - self.started_at,
+            'books': len(self.recommender.books_df),
+            'request_latency': self.request_latency.summary(),
+            'index_query_latency': self.index_latency.summary(),
+            'cache': self.cache.stats()
+        }
+
+
+class RecommendationHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler exposing /recommend, /metrics and /health.
+    """
+
+    service = None
+
+    def do_GET(self):
+        """
+        Route GET requests.
+        """
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+
+        if url.path == '/recommend':
+            title = params.get('title', [''])[0]
+            if not title:
+                self._send_json(400, {'error': "Missing 'title' parameter"})
+                return
+            try:
+                k = int(params.get('k', ['5'])[0])
+            except ValueError:
+                self._send_json(400, {'error': "'k' must be an integer"})
+                return
+
+            try:
+                recommendations = self.service.recommend(title, k)
+            except BookNotFoundError as e:
+                self._send_json(404, {'error': str(e)})
+                return
+            except ValueError as e:
+                self._send_json(400, {'error': str(e)})
+                return
+            except Exception as e:
+                self._send_json(500, {'error': f"Recommendation failed: {e}"})
+                return
+            self._send_json(200, {'title': title, 'recommendations': recommendations})
+
+        elif url.path == '/metrics':
+            self._send_json(200, self.service.metrics())
+
+        elif url.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def _send_json(self, status, payload):
+        """
+        Write a JSON response.
+
+        Args:
+            status (int): HTTP status code
+            payload (dict): Response body
+        """
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """
+        Silence per-request logging; use /metrics instead.
+        """
+
+
+def create_server(service, host='127.0.0.1', port=8000):
+    """
+    Create a threading HTTP server bound to a recommendation service.
+
+    Args:
+        service (RecommendationService): Service answering the requests
+        host (str): Interface to bind
+        port (int): Port to bind
+
+    Returns:
+        ThreadingHTTPServer: Server ready for serve_forever()
+    """
+    handler = type('BoundRecommendationHandler', (RecommendationHandler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Book Recommendation Server')
+    parser.add_argument('--data', default='books.csv',
+                        help='Path to the books CSV file (default: books.csv)')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='Port to bind (default: 8000)')
+    parser.add_argument('--cache-size', type=int, default=1024,
+                        help='Maximum number of cached results (default: 1024)')
+
+    args = parser.parse_args()
+
+    # Load and train once; the model then stays in memory
+    recommender = BookRecommender()
+    recommender.load_data(args.data)
+    recommender.build_feature_matrix()
+    recommender.train_model()
+
+    server = create_server(RecommendationService(recommender, args.cache_size), args.host, args.port)
+    print(f"Serving recommendations on http://{args.host}:{args.port}")
+    print("Endpoints: /recommend?title=...&k=5, /metrics, /health")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
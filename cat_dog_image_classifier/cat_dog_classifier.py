@@ -10,17 +10,189 @@ from tensorflow.keras import layers
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+import csv
+import argparse
+import json
+import tempfile
+import hashlib
+import time
 import cv2
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
 import seaborn as sns
 
 
+class ImageShardSequence(keras.utils.Sequence):
+    """
+    Batches of images read from memory-mapped uint8 shards by index.
+
+    Splits only hold an index array; pixels are read from the shards and
+    normalised one batch at a time.
+    """
+
+    def __init__(self, shards, labels, indices, batch_size=32, shuffle=False):
+        """
+        Initialize the sequence.
+
+        Args:
+            shards (list): Memory-mapped uint8 arrays of images
+            labels (numpy.ndarray): Labels for all images across the shards
+            indices (numpy.ndarray): Global indices of the images in this split
+            batch_size (int): Batch size
+            shuffle (bool): Reshuffle the indices after every epoch, otherwise
+                batches follow the sorted indices
+        """
+        super().__init__()
+        self.shards = shards
+        self.labels = labels
+        self.indices = np.sort(indices)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.offsets = np.cumsum([0] + [len(shard) for shard in shards])
+
+        if self.shuffle:
+            np.random.shuffle(self.indices)
+
+    def __len__(self):
+        return -(-len(self.indices) // self.batch_size)
+
+    def __getitem__(self, batch_idx):
+        # Sorted reads keep memory-mapped access sequential
+        idx = np.sort(self.indices[batch_idx * self.batch_size:(batch_idx + 1) * self.batch_size])
+        shard_ids = np.searchsorted(self.offsets, idx, side='right') - 1
+
+        images = np.empty((len(idx),) + self.shards[0].shape[1:], dtype=np.uint8)
+        for shard_id in np.unique(shard_ids):
+            mask = shard_ids == shard_id
+            images[mask] = self.shards[shard_id][idx[mask] - self.offsets[shard_id]]
+
+        return images.astype('float32') / 255.0, self.labels[idx]
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            np.random.shuffle(self.indices)
+
+
+class TrainingProfiler(keras.callbacks.Callback):
+    """
+    Records step time and input-pipeline stall for every training epoch.
+
+    For tf.data input, wrap() stamps the moment each batch is handed to the
+    training step. The stall of a step is how long after the step started
+    its batch became available; a high stall fraction means the data loader,
+    not the model, is the bottleneck. The first steps of the first epoch
+    include graph tracing and compilation, which would otherwise be counted
+    as stall, so they are left out of the statistics.
+    """
+
+    def __init__(self, verbose=True, warmup_steps=1):
+        """
+        Initialize the profiler.
+
+        Args:
+            verbose (bool): Print a summary line after every epoch
+            warmup_steps (int): Steps at the start of the first epoch left
+                out of the statistics
+        """
+        super().__init__()
+        self.verbose = verbose
+        self.warmup_steps = warmup_steps
+        self.epochs = []
+        self._ready_times = deque()
+        self._begin_times = []
+        self._end_times = []
+
+    def wrap(self, dataset):
+        """
+        Instrument a batched tf.data dataset so input stall can be measured.
+
+        Args:
+            dataset (tf.data.Dataset): Training dataset yielding (images, labels)
+
+        Returns:
+            tf.data.Dataset: The same batches, stamped when they are consumed
+        """
+        def record():
+            self._ready_times.append(time.perf_counter())
+            return 0.0
+
+        def stamp(images, labels):
+            with tf.control_dependencies([tf.py_function(record, [], tf.float32)]):
+                return tf.identity(images), tf.identity(labels)
+
+        return dataset.map(stamp)
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._ready_times.clear()
+        self._begin_times = []
+        self._end_times = []
+        self._epoch_start = time.perf_counter()
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._begin_times.append(time.perf_counter())
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._end_times.append(time.perf_counter())
+
+    def on_epoch_end(self, epoch, logs=None):
+        # With unknown cardinality Keras begins one more step that ends the
+        # epoch without ever finishing, so only matched steps are kept
+        begins = np.array(self._begin_times[:len(self._end_times)])
+        step_times = np.array(self._end_times) - begins
+
+        ready = np.array(list(self._ready_times))[:len(begins)]
+        stalls = np.maximum(ready - begins[:len(ready)], 0.0)
+
+        # Skip the steps that traced and compiled the training function
+        if not self.epochs:
+            skip = min(self.warmup_steps, max(len(step_times) - 1, 0))
+            step_times = step_times[skip:]
+            ready, stalls = ready[skip:], stalls[skip:]
+
+        stats = {
+            'epoch': epoch + 1,
+            'epoch_seconds': time.perf_counter() - self._epoch_start,
+            'steps': len(step_times),
+            'step_ms_mean': float(step_times.mean() * 1000) if len(step_times) else 0.0,
+            'step_ms_p95': float(np.percentile(step_times, 95) * 1000) if len(step_times) else 0.0,
+            'input_stall_seconds': float(stalls.sum()) if len(ready) else None,
+            'input_stall_fraction': float(stalls.sum() / step_times.sum()) if len(ready) else None
+        }
+        self.epochs.append(stats)
+
+        if self.verbose:
+            line = f"Epoch {stats['epoch']}: {stats['step_ms_mean']:.1f} ms/step (p95 {stats['step_ms_p95']:.1f} ms)"
+            if stats['input_stall_fraction'] is not None:
+                bottleneck = 'input pipeline' if stats['input_stall_fraction'] > 0.2 else 'model'
+                line += f", input stall {stats['input_stall_fraction']:.1%} (bottleneck: {bottleneck})"
+            print(line)
+
+
+def cpu_supports_bfloat16():
+    """
+    Check whether the CPU has native bfloat16 instructions.
+
+    Returns:
+        bool: True if AVX512-BF16 or AMX-BF16 is advertised in /proc/cpuinfo
+    """
+    try:
+        with open('/proc/cpuinfo') as f:
+            flags = f.read()
+    except OSError:
+        return False
+
+    return 'avx512_bf16' in flags or 'amx_bf16' in flags
+
+
 class CatDogClassifier:
     """
     A CNN classifier for distinguishing between cat and dog images.
     """
 
+    ARCHITECTURES = ('baseline', 'gap', 'separable')
+
     def __init__(self, input_shape=(128, 128, 3)):
         """
         Initialize the classifier.
@@ -31,85 +203,491 @@ class CatDogClassifier:
         self.input_shape = input_shape
         self.model = None
         self.history = None
+        self.profile = None
+        self.jit_compile = 'auto'
+        self._inference_fn = None
 
-    def build_model(self):
+    def _separable_block(self, filters, strides=1):
         """
-        Build the CNN model architecture.
+        Layers of one MobileNet-style depthwise-separable block.
+
+        Args:
+            filters (int): Number of output channels of the pointwise convolution
+            strides (int): Stride of the depthwise convolution
+
+        Returns:
+            list: Depthwise conv, BN, ReLU, pointwise conv, BN, ReLU
         """
-        model = keras.Sequential([
-            # Convolutional layers
-            layers.Conv2D(32, (3, 3), activation='relu', input_shape=self.input_shape),
-            layers.MaxPooling2D((2, 2)),
+        return [
+            layers.DepthwiseConv2D((3, 3), strides=strides, padding='same', use_bias=False),
+            layers.BatchNormalization(),
+            layers.ReLU(),
+            layers.Conv2D(filters, (1, 1), use_bias=False),
+            layers.BatchNormalization(),
+            layers.ReLU()
+        ]
+
+    def count_flops(self):
+        """
+        Count the floating point operations of one forward pass.
 
-            layers.Conv2D(64, (3, 3), activation='relu'),
-            layers.MaxPooling2D((2, 2)),
+        Multiply-adds of Conv2D, DepthwiseConv2D and Dense layers are counted
+        as two operations; pooling, normalisation and activations are ignored.
 
-            layers.Conv2D(128, (3, 3), activation='relu'),
-            layers.MaxPooling2D((2, 2)),
+        Returns:
+            int: FLOPs per image
+        """
+        if self.model is None:
+            raise ValueError("Model not built yet")
+
+        flops = 0
+        for layer in self.model.layers:
+            if isinstance(layer, layers.DepthwiseConv2D):
+                _, out_h, out_w, _ = layer.output.shape
+                kh, kw = layer.kernel_size
+                flops += 2 * out_h * out_w * kh * kw * layer.input.shape[-1]
+            elif isinstance(layer, layers.Conv2D):
+                _, out_h, out_w, out_c = layer.output.shape
+                kh, kw = layer.kernel_size
+                flops += 2 * out_h * out_w * kh * kw * layer.input.shape[-1] * out_c
+            elif isinstance(layer, layers.Dense):
+                flops += 2 * layer.input.shape[-1] * layer.units
+
+        return int(flops)
+
+    def benchmark_architectures(self, X_train, y_train, X_val, y_val, epochs=5,
+                                architectures=None, n_latency=50, batch_size=32):
+        """
+        Train every architecture and compare size, FLOPs, CPU latency and accuracy.
 
-            layers.Conv2D(128, (3, 3), activation='relu'),
-            layers.MaxPooling2D((2, 2)),
+        The classifier's own model is left untouched; each architecture is
+        trained on a fresh CatDogClassifier with the same input_shape.
 
-            # Flatten and dense layers
-            layers.Flatten(),
-            layers.Dropout(0.5),
-            layers.Dense(512, activation='relu'),
-            layers.Dense(1, activation='sigmoid')  # Binary classification
-        ])
+        Args:
+            X_train: Training images
+            y_train: Training labels
+            X_val: Validation images used for accuracy and latency
+            y_val: Validation labels
+            epochs (int): Training epochs per architecture
+            architectures (tuple): Architectures to compare (default: all)
+            n_latency (int): Number of single-image inferences timed
+            batch_size (int): Batch size for training and the throughput run
+
+        Returns:
+            list: One dictionary of results per architecture
+        """
+        results = []
+
+        for arch in architectures or self.ARCHITECTURES:
+            candidate = CatDogClassifier(self.input_shape)
+            candidate.jit_compile = self.jit_compile
+            candidate.build_model(arch)
+
+            start = time.perf_counter()
+            candidate.train(X_train, y_train, X_val, y_val, epochs=epochs, batch_size=batch_size)
+            train_time = time.perf_counter() - start
+
+            images = np.round(np.asarray(X_val) * 255).astype(np.uint8)
+            infer = candidate._get_inference_fn()
+            infer(images[:1])
+
+            start = time.perf_counter()
+            for img in images[:n_latency]:
+                infer(img[np.newaxis])
+            latency = (time.perf_counter() - start) / min(n_latency, len(images))
+
+            start = time.perf_counter()
+            probabilities = np.concatenate([
+                infer(images[i:i + batch_size]).numpy().flatten()
+                for i in range(0, len(images), batch_size)
+            ])
+            throughput = len(images) / (time.perf_counter() - start)
+
+            results.append({
+                'arch': arch,
+                'params': candidate.model.count_params(),
+                'flops': candidate.count_flops(),
+                'latency_ms': latency * 1000,
+                'images_per_sec': throughput,
+                'train_seconds': train_time,
+                'val_accuracy': float(np.mean((probabilities > 0.5).astype(int) == np.asarray(y_val)))
+            })
+
+        return results
+
+    def configure_training(self, mixed_precision=False, intra_op_threads=None,
+                           inter_op_threads=None, jit_compile='auto'):
+        """
+        Configure precision, threading and XLA compilation for training.
+
+        Call this before build_model(). Mixed precision uses float16 on a
+        GPU and bfloat16 on CPUs with native bfloat16 support, and stays in
+        float32 otherwise. The precision policy and thread counts are global
+        TensorFlow settings; thread counts only take effect before
+        TensorFlow has run any op.
+
+        Args:
+            mixed_precision (bool): Use mixed precision where supported
+            intra_op_threads (int): Threads used inside a single op
+            inter_op_threads (int): Threads used to run independent ops
+            jit_compile (bool or str): XLA-compile the model; 'auto' leaves it to Keras
+
+        Returns:
+            dict: The settings that took effect
+        """
+        policy = 'float32'
+        if mixed_precision:
+            if tf.config.list_physical_devices('GPU'):
+                policy = 'mixed_float16'
+            elif cpu_supports_bfloat16():
+                policy = 'mixed_bfloat16'
+            else:
+                print("CPU has no native bfloat16 support, keeping float32")
+        keras.mixed_precision.set_global_policy(policy)
+
+        try:
+            if intra_op_threads is not None:
+                tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+            if inter_op_threads is not None:
+                tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+        except RuntimeError:
+            print("TensorFlow is already initialized, thread settings unchanged")
+
+        self.jit_compile = jit_compile
+
+        return {
+            'policy': policy,
+            'intra_op_threads': tf.config.threading.get_intra_op_parallelism_threads(),
+            'inter_op_threads': tf.config.threading.get_inter_op_parallelism_threads(),
+            'jit_compile': jit_compile
+        }
+
+    def build_model(self, arch='baseline'):
+        """
+        Build the CNN model architecture.
+
+        Args:
+            arch (str): 'baseline' for four Conv2D blocks with a Flatten and
+                512-unit Dense head, 'gap' for the same blocks with a
+                GlobalAveragePooling head, or 'separable' for a
+                MobileNet-style depthwise-separable network with a
+                GlobalAveragePooling head
+        """
+        if arch == 'baseline':
+            model = keras.Sequential([
+                # Convolutional layers
+                layers.Conv2D(32, (3, 3), activation='relu', input_shape=self.input_shape),
+                layers.MaxPooling2D((2, 2)),
+
+                layers.Conv2D(64, (3, 3), activation='relu'),
+                layers.MaxPooling2D((2, 2)),
+
+                layers.Conv2D(128, (3, 3), activation='relu'),
+                layers.MaxPooling2D((2, 2)),
+
+                layers.Conv2D(128, (3, 3), activation='relu'),
+                layers.MaxPooling2D((2, 2)),
+
+                # Flatten and dense layers
+                layers.Flatten(),
+                layers.Dropout(0.5),
+                layers.Dense(512, activation='relu'),
+                layers.Dense(1, activation='sigmoid', dtype='float32')  # Binary classification, float32 under mixed precision
+            ])
+        elif arch == 'gap':
+            model = keras.Sequential([
+                keras.Input(shape=self.input_shape),
+
+                # Same convolutional layers as the baseline
+                layers.Conv2D(32, (3, 3), activation='relu'),
+                layers.MaxPooling2D((2, 2)),
+
+                layers.Conv2D(64, (3, 3), activation='relu'),
+                layers.MaxPooling2D((2, 2)),
+
+                layers.Conv2D(128, (3, 3), activation='relu'),
+                layers.MaxPooling2D((2, 2)),
+
+                layers.Conv2D(128, (3, 3), activation='relu'),
+                layers.MaxPooling2D((2, 2)),
+
+                # Pooling head instead of Flatten + Dense(512)
+                layers.GlobalAveragePooling2D(),
+                layers.Dropout(0.5),
+                layers.Dense(1, activation='sigmoid', dtype='float32')
+            ])
+        elif arch == 'separable':
+            model = keras.Sequential([
+                keras.Input(shape=self.input_shape),
+
+                # Regular convolution stem
+                layers.Conv2D(32, (3, 3), strides=2, padding='same', use_bias=False),
+                layers.BatchNormalization(),
+                layers.ReLU(),
+
+                # Depthwise-separable blocks, downsampling with strides
+                *self._separable_block(64),
+                *self._separable_block(128, strides=2),
+                *self._separable_block(128),
+                *self._separable_block(256, strides=2),
+                *self._separable_block(256),
+                *self._separable_block(512, strides=2),
+
+                layers.GlobalAveragePooling2D(),
+                layers.Dropout(0.3),
+                layers.Dense(1, activation='sigmoid', dtype='float32')
+            ])
+        else:
+            raise ValueError(f"Unknown architecture '{arch}', choose from {self.ARCHITECTURES}")
 
         # Compile the model
         model.compile(
             optimizer='adam',
             loss='binary_crossentropy',
-            metrics=['accuracy']
+            metrics=['accuracy'],
+            jit_compile=self.jit_compile
         )
 
         self.model = model
+        self._inference_fn = None
         return model
 
-    def load_and_preprocess_data(self, data_dir, test_size=0.2, validation_split=0.2):
+    def list_image_files(self, data_dir):
+        """
+        List the image files and labels under the 'cats' and 'dogs' subdirectories.
+
+        Args:
+            data_dir (str): Directory containing 'cats' and 'dogs' subdirectories
+
+        Returns:
+            tuple: (list of image paths, numpy.ndarray of labels)
+        """
+        paths = []
+        labels = []
+
+        for label, class_dir in enumerate(['cats', 'dogs']):  # 0 for cats, 1 for dogs
+            class_path = os.path.join(data_dir, class_dir)
+            if os.path.exists(class_path):
+                for filename in sorted(os.listdir(class_path)):
+                    if filename.endswith(('.jpg', '.jpeg', '.png')):
+                        paths.append(os.path.join(class_path, filename))
+                        labels.append(label)
+
+        if not paths:
+            raise ValueError("No images found in the specified directory")
+
+        return paths, np.array(labels)
+
+    def make_datasets(self, data_dir, test_size=0.2, validation_split=0.2, batch_size=32, cache=True):
+        """
+        Build streaming tf.data pipelines for training, validation and testing.
+
+        Only the file list is split up front. Images are decoded and resized
+        in parallel, kept as uint8 and normalised to float32 per batch, so
+        memory is bounded by the batch size rather than the dataset.
+
+        Args:
+            data_dir (str): Directory containing 'cats' and 'dogs' subdirectories
+            test_size (float): Fraction of data to use for testing
+            validation_split (float): Fraction of training data for validation
+            batch_size (int): Batch size
+            cache (bool or str): Cache decoded uint8 images in memory (True),
+                in a file at the given path, or not at all (False)
+
+        Returns:
+            tuple: (train_ds, val_ds, test_ds) yielding (images, labels) batches
+        """
+        paths, labels = self.list_image_files(data_dir)
+
+        # Split the file list the same way load_and_preprocess_data() splits arrays
+        paths_train_val, paths_test, y_train_val, y_test = train_test_split(
+            paths, labels, test_size=test_size, random_state=42, stratify=labels
+        )
+
+        paths_train, paths_val, y_train, y_val = train_test_split(
+            paths_train_val, y_train_val, test_size=validation_split, random_state=42, stratify=y_train_val
+        )
+
+        # tf.data caches in memory for '' and on disk for a filename
+        if cache is True:
+            cache_files = ['', '', '']
+        elif cache:
+            cache_files = [f'{cache}_{split}' for split in ('train', 'val', 'test')]
+        else:
+            cache_files = [None, None, None]
+
+        train_ds = self._build_pipeline(paths_train, y_train, batch_size, cache_files[0], shuffle=True)
+        val_ds = self._build_pipeline(paths_val, y_val, batch_size, cache_files[1])
+        test_ds = self._build_pipeline(paths_test, y_test, batch_size, cache_files[2])
+
+        return train_ds, val_ds, test_ds
+
+    def _build_pipeline(self, paths, labels, batch_size, cache_file=None, shuffle=False):
+        """
+        Build one decode -> cache -> shuffle -> batch -> normalise -> prefetch pipeline.
+
+        Args:
+            paths (list): Image paths
+            labels (numpy.ndarray): Labels matching the paths
+            batch_size (int): Batch size
+            cache_file (str): '' to cache in memory, a path to cache on disk,
+                or None to decode on every epoch
+            shuffle (bool): Reshuffle the examples every epoch
+
+        Returns:
+            tf.data.Dataset: Dataset of (float32 images, labels) batches
+        """
+        dataset = self._decode_images(tf.data.Dataset.from_tensor_slices((paths, labels)))
+
+        if cache_file is not None:
+            dataset = dataset.cache(cache_file)
+
+        if shuffle:
+            dataset = dataset.shuffle(min(len(paths), 10000), seed=42, reshuffle_each_iteration=True)
+
+        dataset = dataset.batch(batch_size)
+        dataset = dataset.map(self._normalize, num_parallel_calls=tf.data.AUTOTUNE)
+
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+    def _decode_images(self, dataset):
+        """
+        Decode and resize a dataset of (path, label) pairs.
+
+        Files that cannot be read or decoded are skipped, as
+        load_and_preprocess_data() skips them.
+
+        Args:
+            dataset (tf.data.Dataset): Dataset of (path, label) pairs
+
+        Returns:
+            tf.data.Dataset: Dataset of (uint8 image, label) pairs
+        """
+        dataset = dataset.map(self._decode_and_resize, num_parallel_calls=tf.data.AUTOTUNE)
+        dataset = dataset.ignore_errors().filter(lambda img, label, loaded: loaded)
+
+        return dataset.map(lambda img, label, loaded: (img, label))
+
+    def _decode_and_resize(self, path, label):
+        """
+        Decode and resize one image inside the tf.data graph.
+
+        Decoding and resizing run through OpenCV, exactly as in
+        load_and_resize_image(), so the model trains on the same inputs
+        predict() serves.
+
+        Args:
+            path (tf.Tensor): Image path
+            label (tf.Tensor): Image label
+
+        Returns:
+            tuple: (uint8 image tensor, label, whether the image decoded)
+        """
+        img, loaded = tf.numpy_function(
+            self._decode_image_bytes, [tf.io.read_file(path)], (tf.uint8, tf.bool), stateful=False
+        )
+        img.set_shape(self.input_shape)
+        loaded.set_shape(())
+
+        return img, label, loaded
+
+    def _decode_image_bytes(self, data):
+        """
+        Decode encoded image bytes into a resized RGB uint8 array.
+
+        Args:
+            data (bytes): Encoded image file contents
+
+        Returns:
+            tuple: (resized uint8 RGB image, or zeros if decoding fails;
+                whether decoding succeeded)
+        """
+        img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            return np.zeros(self.input_shape, dtype=np.uint8), np.bool_(False)
+
+        return self._to_model_input(img), np.bool_(True)
+
+    def _to_model_input(self, img):
+        """
+        Convert a decoded BGR image to a resized RGB image.
+
+        Args:
+            img (numpy.ndarray): BGR image as returned by OpenCV
+
+        Returns:
+            numpy.ndarray: Resized uint8 RGB image
+        """
+        # Convert BGR to RGB
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+        # Resize image
+        return cv2.resize(img, (self.input_shape[1], self.input_shape[0]))
+
+    def _normalize(self, images, labels):
+        """
+        Convert a uint8 batch to float32 in [0, 1].
+
+        Args:
+            images (tf.Tensor): uint8 image batch
+            labels (tf.Tensor): Label batch
+
+        Returns:
+            tuple: (float32 image batch, labels)
+        """
+        return tf.cast(images, tf.float32) / 255.0, labels
+
+    def load_and_preprocess_data(self, data_dir, test_size=0.2, validation_split=0.2,
+                                 cache_dir=None, batch_size=32):
         """
         Load and preprocess image data.
 
+        With cache_dir, the images come from the memory-mapped shard cache
+        (built on first use) and the splits are ImageShardSequence objects
+        over index arrays instead of copies of the pixel data.
+
         Args:
             data_dir (str): Directory containing 'cats' and 'dogs' subdirectories
             test_size (float): Fraction of data to use for testing
             validation_split (float): Fraction of training data for validation
+            cache_dir (str): Directory of the preprocessed shard cache
+            batch_size (int): Batch size of the sequences when cache_dir is used
 
         Returns:
             tuple: (X_train, X_val, X_test, y_train, y_val, y_test)
         """
-        images = []
-        labels = []
-
-        # Load cat images
-        cat_dir = os.path.join(data_dir, 'cats')
-        if os.path.exists(cat_dir):
-            for filename in os.listdir(cat_dir):
-                if filename.endswith(('.jpg', '.jpeg', '.png')):
-                    img_path = os.path.join(cat_dir, filename)
-                    img = self.load_and_resize_image(img_path)
-                    if img is not None:
-                        images.append(img)
-                        labels.append(0)  # 0 for cats
-
-        # Load dog images
-        dog_dir = os.path.join(data_dir, 'dogs')
-        if os.path.exists(dog_dir):
-            for filename in os.listdir(dog_dir):
-                if filename.endswith(('.jpg', '.jpeg', '.png')):
-                    img_path = os.path.join(dog_dir, filename)
-                    img = self.load_and_resize_image(img_path)
-                    if img is not None:
-                        images.append(img)
-                        labels.append(1)  # 1 for dogs
-
-        if not images:
+        if cache_dir is not None:
+            shards, labels = self.open_image_cache(data_dir, cache_dir)
+
+            # Split the indices the same way the arrays are split below
+            idx_train_val, idx_test = train_test_split(
+                np.arange(len(labels)), test_size=test_size, random_state=42, stratify=labels
+            )
+
+            idx_train, idx_val = train_test_split(
+                idx_train_val, test_size=validation_split, random_state=42, stratify=labels[idx_train_val]
+            )
+
+            # Sorted so the returned labels follow the order of the batches
+            idx_val = np.sort(idx_val)
+            idx_test = np.sort(idx_test)
+
+            return (
+                ImageShardSequence(shards, labels, idx_train, batch_size, shuffle=True),
+                ImageShardSequence(shards, labels, idx_val, batch_size),
+                ImageShardSequence(shards, labels, idx_test, batch_size),
+                labels[idx_train], labels[idx_val], labels[idx_test]
+            )
+
+        paths, labels = self.list_image_files(data_dir)
+
+        # Decode in parallel and drop images that could not be read
+        X, loaded = self.load_images(paths)
+        if not loaded.any():
             raise ValueError("No images found in the specified directory")
-
-        # Convert to numpy arrays
-        X = np.array(images)
-        y = np.array(labels)
+        if not loaded.all():
+            X = X[loaded]
+        y = labels[loaded]
 
         # Normalize pixel values
         X = X.astype('float32') / 255.0
@@ -125,6 +703,192 @@ class CatDogClassifier:
 
         return X_train, X_val, X_test, y_train, y_val, y_test
 
+    def build_image_cache(self, data_dir, cache_dir, shard_size=4096):
+        """
+        Decode every image once and store it in uint8 .npy shards.
+
+        The cache directory holds the shards, a labels.npy index and a
+        manifest.json recording input_shape plus the size, mtime and SHA-1
+        of every source file. The manifest is written last, so an
+        interrupted build is never mistaken for a complete cache.
+
+        Args:
+            data_dir (str): Directory containing 'cats' and 'dogs' subdirectories
+            cache_dir (str): Directory to write the cache to
+            shard_size (int): Maximum number of images per shard
+        """
+        paths, labels = self.list_image_files(data_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        manifest_path = os.path.join(cache_dir, 'manifest.json')
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+        files = []
+        shards = []
+        cached_labels = []
+
+        for start in range(0, len(paths), shard_size):
+            shard_paths = paths[start:start + shard_size]
+            images, loaded = self.load_images(shard_paths)
+
+            # Only images that decoded are stored
+            shard_file = f'shard_{len(shards):05d}.npy'
+            shard = np.lib.format.open_memmap(
+                os.path.join(cache_dir, shard_file), mode='w+',
+                dtype=np.uint8, shape=(int(loaded.sum()),) + tuple(self.input_shape)
+            )
+            shard[:] = images[loaded]
+            shard.flush()
+            del shard
+
+            shards.append(shard_file)
+            cached_labels.append(labels[start:start + shard_size][loaded])
+
+            for path in shard_paths:
+                files.append(self._file_signature(data_dir, path, with_hash=True))
+
+        np.save(os.path.join(cache_dir, 'labels.npy'), np.concatenate(cached_labels))
+
+        with open(manifest_path, 'w') as f:
+            json.dump({
+                'input_shape': list(self.input_shape),
+                'shards': shards,
+                'files': files
+            }, f)
+
+        print(f"Cached {sum(len(l) for l in cached_labels)} images in {len(shards)} shards")
+
+    def open_image_cache(self, data_dir, cache_dir, shard_size=4096):
+        """
+        Open the shard cache memory-mapped, rebuilding it when it is stale.
+
+        Args:
+            data_dir (str): Directory containing 'cats' and 'dogs' subdirectories
+            cache_dir (str): Directory of the shard cache
+            shard_size (int): Maximum number of images per shard when rebuilding
+
+        Returns:
+            tuple: (list of memory-mapped uint8 shards, numpy.ndarray of labels)
+        """
+        manifest = self._read_valid_manifest(data_dir, cache_dir)
+        if manifest is None:
+            print("Image cache missing or stale, rebuilding")
+            self.build_image_cache(data_dir, cache_dir, shard_size)
+            manifest = self._read_valid_manifest(data_dir, cache_dir)
+
+        shards = [
+            np.load(os.path.join(cache_dir, shard_file), mmap_mode='r')
+            for shard_file in manifest['shards']
+        ]
+        labels = np.load(os.path.join(cache_dir, 'labels.npy'))
+
+        return shards, labels
+
+    def _read_valid_manifest(self, data_dir, cache_dir):
+        """
+        Read the cache manifest if it still matches input_shape and the files.
+
+        Files whose size and mtime are unchanged are trusted; only files that
+        were touched are re-hashed and compared.
+
+        Args:
+            data_dir (str): Directory containing 'cats' and 'dogs' subdirectories
+            cache_dir (str): Directory of the shard cache
+
+        Returns:
+            dict: The manifest, or None if the cache is missing or stale
+        """
+        manifest_path = os.path.join(cache_dir, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return None
+
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+        if tuple(manifest['input_shape']) != tuple(self.input_shape):
+            return None
+
+        paths, _ = self.list_image_files(data_dir)
+        if len(paths) != len(manifest['files']):
+            return None
+
+        for path, cached in zip(paths, manifest['files']):
+            current = self._file_signature(data_dir, path)
+            if current['path'] != cached['path']:
+                return None
+            if (current['size'], current['mtime_ns']) != (cached['size'], cached['mtime_ns']):
+                if self._file_signature(data_dir, path, with_hash=True)['sha1'] != cached['sha1']:
+                    return None
+
+        return manifest
+
+    def _file_signature(self, data_dir, path, with_hash=False):
+        """
+        Describe a source image for the cache manifest.
+
+        Args:
+            data_dir (str): Directory the relative path is taken from
+            path (str): Image path
+            with_hash (bool): Also compute the SHA-1 of the file contents
+
+        Returns:
+            dict: Relative path, size, mtime and optionally the SHA-1
+        """
+        stat = os.stat(path)
+        signature = {
+            'path': os.path.relpath(path, data_dir),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns
+        }
+
+        if with_hash:
+            with open(path, 'rb') as f:
+                signature['sha1'] = hashlib.sha1(f.read()).hexdigest()
+
+        return signature
+
+    def load_images(self, paths, n_workers=None, chunk_size=256):
+        """
+        Decode and resize many images in parallel into one uint8 array.
+
+        Chunks of paths are spread over a thread pool; OpenCV releases the
+        GIL while decoding and resizing, so the threads run concurrently and
+        write straight into a preallocated array.
+
+        Args:
+            paths (list): Image paths
+            n_workers (int): Number of worker threads (default: CPU count)
+            chunk_size (int): Maximum number of images handed to a worker at a time
+
+        Returns:
+            tuple: (uint8 array of shape (n, height, width, channels),
+                boolean array marking the images that loaded)
+        """
+        images = np.zeros((len(paths),) + tuple(self.input_shape), dtype=np.uint8)
+        loaded = np.zeros(len(paths), dtype=bool)
+
+        # Smaller chunks for small inputs so every worker gets some
+        n_workers = n_workers or os.cpu_count()
+        chunk_size = max(1, min(chunk_size, -(-len(paths) // n_workers)))
+
+        def load_chunk(start):
+            for i in range(start, min(start + chunk_size, len(paths))):
+                img = self.load_and_resize_image(paths[i])
+                if img is not None:
+                    images[i] = img
+                    loaded[i] = True
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(load_chunk, range(0, len(paths), chunk_size)))
+        elapsed = time.perf_counter() - start_time
+
+        print(f"Loaded {loaded.sum()} images in {elapsed:.2f}s "
+              f"({loaded.sum() / max(elapsed, 1e-9):.0f} images/sec)")
+
+        return images, loaded
+
     def load_and_resize_image(self, image_path):
         """
         Load and resize an image.
@@ -140,28 +904,26 @@ class CatDogClassifier:
             if img is None:
                 return None
 
-            # Convert BGR to RGB
-            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-
-            # Resize image
-            img = cv2.resize(img, (self.input_shape[1], self.input_shape[0]))
-
-            return img
+            return self._to_model_input(img)
         except Exception as e:
             print(f"Error loading image {image_path}: {e}")
             return None
 
-    def train(self, X_train, y_train, X_val, y_val, epochs=20, batch_size=32):
+    def train(self, X_train, y_train=None, X_val=None, y_val=None, epochs=20, batch_size=32,
+              profile=False, log_dir=None):
         """
         Train the model.
 
         Args:
-            X_train: Training images
-            y_train: Training labels
-            X_val: Validation images
-            y_val: Validation labels
+            X_train: Training images, a tf.data.Dataset from make_datasets() or
+                an ImageShardSequence from load_and_preprocess_data()
+            y_train: Training labels (unused for a dataset or sequence)
+            X_val: Validation images, dataset or sequence
+            y_val: Validation labels (unused for a dataset or sequence)
             epochs (int): Number of training epochs
-            batch_size (int): Batch size for training
+            batch_size (int): Batch size for training (unused for a dataset or sequence)
+            profile (bool): Record step time and input stall per epoch in self.profile
+            log_dir (str): Write a TensorBoard profiler trace of a few steps here
         """
         if self.model is None:
             self.build_model()
@@ -172,25 +934,45 @@ class CatDogClassifier:
             patience=5,
             restore_best_weights=True
         )
-
-        # Train the model
-        self.history = self.model.fit(
-            X_train, y_train,
-            epochs=epochs,
-            batch_size=batch_size,
-            validation_data=(X_val, y_val),
-            callbacks=[early_stopping]
-        )
+        callbacks = [early_stopping]
+
+        # Optional profiling of step time, input stall and a TensorBoard trace
+        if profile:
+            profiler = TrainingProfiler()
+            if isinstance(X_train, tf.data.Dataset):
+                X_train = profiler.wrap(X_train)
+            callbacks.append(profiler)
+            self.profile = profiler.epochs
+
+        if log_dir is not None:
+            callbacks.append(keras.callbacks.TensorBoard(log_dir=log_dir, profile_batch=(2, 6)))
+
+        # Train the model; datasets and sequences are already batched
+        if isinstance(X_train, (tf.data.Dataset, keras.utils.Sequence)):
+            self.history = self.model.fit(
+                X_train,
+                epochs=epochs,
+                validation_data=X_val,
+                callbacks=callbacks
+            )
+        else:
+            self.history = self.model.fit(
+                X_train, y_train,
+                epochs=epochs,
+                batch_size=batch_size,
+                validation_data=(X_val, y_val),
+                callbacks=callbacks
+            )
 
         return self.history
 
-    def evaluate(self, X_test, y_test):
+    def evaluate(self, X_test, y_test=None):
         """
         Evaluate the model on test data.
 
         Args:
-            X_test: Test images
-            y_test: Test labels
+            X_test: Test images, or an unshuffled dataset or sequence
+            y_test: Test labels (unused for a dataset or sequence)
 
         Returns:
             dict: Evaluation results
@@ -203,7 +985,14 @@ class CatDogClassifier:
         y_pred = (y_pred_prob > 0.5).astype(int).flatten()
 
         # Calculate metrics
-        test_loss, test_accuracy = self.model.evaluate(X_test, y_test, verbose=0)
+        if isinstance(X_test, tf.data.Dataset):
+            y_test = np.concatenate([labels.numpy() for _, labels in X_test])
+            test_loss, test_accuracy = self.model.evaluate(X_test, verbose=0)
+        elif isinstance(X_test, ImageShardSequence):
+            y_test = X_test.labels[X_test.indices]
+            test_loss, test_accuracy = self.model.evaluate(X_test, verbose=0)
+        else:
+            test_loss, test_accuracy = self.model.evaluate(X_test, y_test, verbose=0)
 
         # Classification report
         class_names = ['Cat', 'Dog']
@@ -251,6 +1040,315 @@ class CatDogClassifier:
         class_names = ['Cat', 'Dog']
         return class_names[prediction], confidence
 
+    def _get_inference_fn(self):
+        """
+        Get a compiled inference function for uint8 image batches.
+
+        Normalisation runs inside the graph, and calling the model directly
+        with training=False avoids the per-call overhead of model.predict().
+
+        Returns:
+            tf.types.experimental.GenericFunction: Function mapping uint8
+                batches to dog probabilities
+        """
+        if self._inference_fn is None:
+            model = self.model
+
+            @tf.function(input_signature=[
+                tf.TensorSpec((None,) + tuple(self.input_shape), tf.uint8)
+            ])
+            def infer(images):
+                return model(tf.cast(images, tf.float32) / 255.0, training=False)
+
+            self._inference_fn = infer
+
+        return self._inference_fn
+
+    def iter_predictions(self, image_paths, batch_size=64):
+        """
+        Predict many images, decoding the next batches while the current one runs.
+
+        Images that cannot be decoded are skipped.
+
+        Args:
+            image_paths (list): Paths of the images to classify
+            batch_size (int): Number of images per inference call
+
+        Yields:
+            tuple: (path, prediction, confidence) for each decoded image
+        """
+        if self.model is None:
+            raise ValueError("Model not trained yet")
+
+        infer = self._get_inference_fn()
+        class_names = ['Cat', 'Dog']
+
+        # An explicit string dtype keeps an empty path list from becoming float32
+        paths = tf.constant(list(image_paths), dtype=tf.string)
+        dataset = self._decode_images(tf.data.Dataset.from_tensor_slices((paths, paths)))
+        dataset = dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+        for images, paths in dataset:
+            probabilities = infer(images).numpy().flatten()
+            for path, prob in zip(paths.numpy(), probabilities):
+                prediction = 1 if prob > 0.5 else 0
+                confidence = prob if prediction == 1 else 1 - prob
+                yield path.decode('utf-8'), class_names[prediction], float(confidence)
+
+    def predict_batch(self, image_paths, batch_size=64):
+        """
+        Predict whether each of many images contains a cat or dog.
+
+        Args:
+            image_paths (list): Paths of the images to classify
+            batch_size (int): Number of images per inference call
+
+        Returns:
+            list: (path, prediction, confidence) tuples for every decoded image
+        """
+        return list(self.iter_predictions(image_paths, batch_size))
+
+    def predict_dir(self, directory, output_csv, batch_size=64):
+        """
+        Classify every image under a directory and stream the results to CSV.
+
+        Args:
+            directory (str): Directory searched recursively for images
+            output_csv (str): Path of the CSV file to write
+            batch_size (int): Number of images per inference call
+
+        Returns:
+            dict: Number of images written, elapsed seconds and images/sec
+        """
+        image_paths = sorted(
+            os.path.join(root, filename)
+            for root, _, filenames in os.walk(directory)
+            for filename in filenames
+            if filename.lower().endswith(('.jpg', '.jpeg', '.png'))
+        )
+
+        start = time.perf_counter()
+        count = 0
+        with open(output_csv, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['path', 'label', 'confidence'])
+            for path, label, confidence in self.iter_predictions(image_paths, batch_size):
+                writer.writerow([path, label, f'{confidence:.6f}'])
+                count += 1
+        elapsed = time.perf_counter() - start
+
+        return {'images': count, 'seconds': elapsed, 'images_per_sec': count / max(elapsed, 1e-9)}
+
+    def check_batch_consistency(self, image_paths, n_images=16, tolerance=1e-4):
+        """
+        Check that predict_batch() reproduces predict() on the same files.
+
+        Args:
+            image_paths (list): Paths of the images to compare
+            n_images (int): Number of images compared
+            tolerance (float): Largest allowed difference in dog probability
+
+        Returns:
+            float: Largest absolute difference in dog probability
+        """
+        batch = self.predict_batch(image_paths[:n_images])
+
+        max_diff = 0.0
+        for path, batch_label, batch_confidence in batch:
+            label, confidence = self.predict(path)
+            if label != batch_label:
+                raise ValueError(f"predict_batch() and predict() disagree on {path}")
+            batch_prob = batch_confidence if batch_label == 'Dog' else 1 - batch_confidence
+            prob = confidence if label == 'Dog' else 1 - confidence
+            max_diff = max(max_diff, abs(float(batch_prob) - float(prob)))
+
+        if max_diff > tolerance:
+            raise ValueError(f"predict_batch() differs from predict() by {max_diff:.2e}")
+
+        return max_diff
+
+    def benchmark_inference(self, image_paths, batch_sizes=(1, 32, 128), n_single=50):
+        """
+        Compare per-image predict() against batched inference in images/sec.
+
+        Args:
+            image_paths (list): Paths of the images to classify
+            batch_sizes (tuple): Batch sizes to time with predict_batch()
+            n_single (int): Number of images timed with predict()
+
+        Returns:
+            dict: Images/sec for 'predict' and for each batch size, and the
+                largest probability difference between the two paths
+        """
+        # Warm up tracing and the compiled function
+        self.predict_batch(image_paths[:1], batch_size=1)
+
+        results = {'max_abs_diff': self.check_batch_consistency(image_paths)}
+
+        single_paths = image_paths[:n_single]
+        start = time.perf_counter()
+        for path in single_paths:
+            self.predict(path)
+        results['predict'] = len(single_paths) / (time.perf_counter() - start)
+
+        for batch_size in batch_sizes:
+            start = time.perf_counter()
+            count = len(self.predict_batch(image_paths, batch_size))
+            results[f'batch_{batch_size}'] = count / (time.perf_counter() - start)
+
+        return results
+
+    def export_tflite(self, filepath, quantization='dynamic', calibration_data=None, n_calibration=200):
+        """
+        Export the model as a post-training-quantised TFLite model for CPU serving.
+
+        Args:
+            filepath (str): Path of the .tflite file to write
+            quantization (str): 'float' for no quantisation, 'dynamic' for
+                dynamic-range (int8 weights), or 'int8' for full integer
+                quantisation with uint8 input and output
+            calibration_data: Images used to calibrate 'int8': a float32 array,
+                a dataset from make_datasets() or an ImageShardSequence
+            n_calibration (int): Number of calibration images used
+
+        Returns:
+            int: Size of the exported model in bytes
+        """
+        if self.model is None:
+            raise ValueError("No model to export")
+
+        converter = tf.lite.TFLiteConverter.from_keras_model(self._float32_model())
+
+        if quantization in ('dynamic', 'int8'):
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+        if quantization == 'int8':
+            if calibration_data is None:
+                raise ValueError("Full int8 quantisation needs calibration_data")
+            converter.representative_dataset = lambda: self._representative_images(calibration_data, n_calibration)
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            converter.inference_input_type = tf.uint8
+            converter.inference_output_type = tf.uint8
+        elif quantization not in ('float', 'dynamic'):
+            raise ValueError(f"Unknown quantization '{quantization}'")
+
+        tflite_model = converter.convert()
+        with open(filepath, 'wb') as f:
+            f.write(tflite_model)
+
+        return len(tflite_model)
+
+    def _float32_model(self):
+        """
+        Get the model with every layer computing in float32.
+
+        A model built under a mixed precision policy from configure_training()
+        has bfloat16 or float16 ops the TFLite builtins cannot convert, so it
+        is cloned with float32 layers and the trained weights copied over.
+
+        Returns:
+            keras.Model: The model itself, or a float32 clone of it
+        """
+        if all(layer.dtype_policy.compute_dtype == 'float32' for layer in self.model.layers):
+            return self.model
+
+        def to_float32(layer):
+            return layer.__class__.from_config(dict(layer.get_config(), dtype='float32'))
+
+        model = keras.models.clone_model(self.model, clone_function=to_float32)
+        model.set_weights(self.model.get_weights())
+        return model
+
+    def _representative_images(self, calibration_data, n_calibration):
+        """
+        Yield single calibration images for the TFLite converter.
+
+        Args:
+            calibration_data: Float32 image array, dataset or ImageShardSequence
+            n_calibration (int): Number of images to yield
+
+        Yields:
+            list: One float32 array of shape (1, height, width, channels)
+        """
+        if isinstance(calibration_data, tf.data.Dataset):
+            batches = (images for images, _ in calibration_data.as_numpy_iterator())
+        elif isinstance(calibration_data, keras.utils.Sequence):
+            batches = (calibration_data[i][0] for i in range(len(calibration_data)))
+        else:
+            batches = [np.asarray(calibration_data)]
+
+        count = 0
+        for batch in batches:
+            for img in batch:
+                yield [img[np.newaxis].astype('float32')]
+                count += 1
+                if count >= n_calibration:
+                    return
+
+    def compare_tflite(self, tflite_path, X_test, y_test, batch_size=32):
+        """
+        Compare a TFLite export against the float Keras model.
+
+        Args:
+            tflite_path (str): Path to a model written by export_tflite()
+            X_test: Normalised float32 test images
+            y_test: Test labels
+            batch_size (int): Batch size for the throughput runs
+
+        Returns:
+            dict: Latency, throughput, size and accuracy of both models, plus
+                the accuracy difference (TFLite minus Keras)
+        """
+        from cat_dog_tflite import TFLiteCatDogClassifier
+
+        if self.model is None:
+            raise ValueError("Model not trained yet")
+
+        images = np.round(np.asarray(X_test) * 255).astype(np.uint8)
+        y_test = np.asarray(y_test).flatten()
+
+        # Float model through the same compiled function as predict_batch()
+        infer = self._get_inference_fn()
+        infer(images[:1])
+
+        start = time.perf_counter()
+        for img in images:
+            infer(img[np.newaxis])
+        keras_latency = (time.perf_counter() - start) / len(images)
+
+        start = time.perf_counter()
+        keras_probs = np.concatenate([
+            infer(images[i:i + batch_size]).numpy().flatten()
+            for i in range(0, len(images), batch_size)
+        ])
+        keras_throughput = len(images) / (time.perf_counter() - start)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            keras_path = os.path.join(tmp_dir, 'model.keras')
+            self.model.save(keras_path)
+            keras_size = os.path.getsize(keras_path)
+
+        runtime = TFLiteCatDogClassifier(tflite_path)
+        tflite_stats = runtime.benchmark(images, batch_size)
+        tflite_probs = np.concatenate([
+            runtime.predict_proba(images[i:i + batch_size])
+            for i in range(0, len(images), batch_size)
+        ])
+
+        keras_accuracy = np.mean((keras_probs > 0.5).astype(int) == y_test)
+        tflite_accuracy = np.mean((tflite_probs > 0.5).astype(int) == y_test)
+
+        return {
+            'keras': {
+                'latency_ms': keras_latency * 1000,
+                'images_per_sec': keras_throughput,
+                'size_bytes': keras_size,
+                'accuracy': keras_accuracy
+            },
+            'tflite': dict(tflite_stats, accuracy=tflite_accuracy),
+            'accuracy_delta': tflite_accuracy - keras_accuracy
+        }
+
     def save_model(self, filepath):
         """
         Save the trained model.
@@ -270,6 +1368,7 @@ class CatDogClassifier:
             filepath (str): Path to the saved model
         """
         self.model = keras.models.load_model(filepath)
+        self._inference_fn = None
 
     def plot_training_history(self):
         """
@@ -300,11 +1399,45 @@ class CatDogClassifier:
         return fig
 
 
+def predict_dir_cli(args):
+    """
+    Classify a directory of images with a saved model and write a CSV.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+    """
+    classifier = CatDogClassifier(input_shape=(args.image_size, args.image_size, 3))
+    classifier.load_model(args.model)
+
+    stats = classifier.predict_dir(args.predict_dir, args.output, args.batch_size)
+    print(f"Wrote {stats['images']} predictions to {args.output} "
+          f"in {stats['seconds']:.2f}s ({stats['images_per_sec']:.0f} images/sec)")
+
+
 def main():
     """
     Example usage of the CatDogClassifier.
     Note: This requires actual image data to work properly.
     """
+    parser = argparse.ArgumentParser(description='Cat and Dog Image Classifier')
+    parser.add_argument('--predict-dir',
+                        help='Classify every image in this directory and write a CSV')
+    parser.add_argument('--model', help='Path to a saved model (required with --predict-dir)')
+    parser.add_argument('--output', default='predictions.csv',
+                        help='CSV file for --predict-dir results (default: predictions.csv)')
+    parser.add_argument('--batch-size', type=int, default=64,
+                        help='Images per inference batch (default: 64)')
+    parser.add_argument('--image-size', type=int, default=128,
+                        help='Input height and width of the model (default: 128)')
+
+    args = parser.parse_args()
+
+    if args.predict_dir:
+        if not args.model:
+            parser.error('--model is required with --predict-dir')
+        predict_dir_cli(args)
+        return
+
     print("Cat and Dog Image Classifier")
     print("=" * 40)
 
@@ -334,12 +1467,21 @@ def main():
     # Train model (requires actual data)
     # history = classifier.train(X_train, y_train, X_val, y_val)
 
+    # Or stream the images with tf.data instead of loading them into memory
+    # train_ds, val_ds, test_ds = classifier.make_datasets('path/to/data')
+    # history = classifier.train(train_ds, X_val=val_ds)
+
     # Evaluate (requires actual data)
     # results = classifier.evaluate(X_test, y_test)
 
     # Make prediction on single image
     # prediction, confidence = classifier.predict('path/to/image.jpg')
     # print(f"Predicted: {prediction} (confidence: {confidence:.2f})")
+
+    # Classify many images in large batches
+    # results = classifier.predict_batch(['a.jpg', 'b.jpg'], batch_size=64)
+    # Or from the command line:
+    # python cat_dog_classifier.py --predict-dir path/to/images --model model.keras
     """)
 
 
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Cat and Dog Image Classifier - TFLite Runtime
+This script runs a quantised TFLite export of the CatDogClassifier without
+importing Keras, for CPU-only serving.
+"""
+
+import os
+import time
+
+import cv2
+import numpy as np
+
+try:
+    from ai_edge_litert.interpreter import Interpreter
+except ImportError:
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        # Falls back to the interpreter bundled with TensorFlow
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+
+
+class TFLiteCatDogClassifier:
+    """
+    Runs a TFLite model exported by CatDogClassifier.export_tflite().
+    """
+
+    def __init__(self, model_path, num_threads=None):
+        """
+        Load the TFLite model.
+
+        Args:
+            model_path (str): Path to the .tflite file
+            num_threads (int): Number of interpreter threads (default: CPU count)
+        """
+        self.model_path = model_path
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads or os.cpu_count())
+        self.interpreter.allocate_tensors()
+
+        self.input_details = self.interpreter.get_input_details()[0]
+        self.output_details = self.interpreter.get_output_details()[0]
+        self.input_shape = tuple(self.input_details['shape'][1:])
+        self._batch_size = int(self.input_details['shape'][0])
+
+    def load_image(self, image_path):
+        """
+        Load and resize an image the same way CatDogClassifier does.
+
+        Args:
+            image_path (str): Path to the image file
+
+        Returns:
+            numpy.ndarray: Resized uint8 RGB image, or None if loading fails
+        """
+        img = cv2.imread(image_path)
+        if img is None:
+            return None
+
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        return cv2.resize(img, (self.input_shape[1], self.input_shape[0]))
+
+    def predict_proba(self, images):
+        """
+        Get the dog probability for a batch of images.
+
+        Args:
+            images (numpy.ndarray): uint8 images of shape (n, height, width, channels)
+
+        Returns:
+            numpy.ndarray: Dog probability per image
+        """
+        images = np.asarray(images)
+        if images.shape[0] != self._batch_size:
+            self.interpreter.resize_tensor_input(
+                self.input_details['index'], (images.shape[0],) + self.input_shape
+            )
+            self.interpreter.allocate_tensors()
+            self._batch_size = images.shape[0]
+
+        self.interpreter.set_tensor(self.input_details['index'], self._quantize_input(images))
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self.output_details['index'])
+
+        return self._dequantize_output(output).flatten()
+
+    def _quantize_input(self, images):
+        """
+        Convert uint8 pixels to the model's input type.
+
+        Args:
+            images (numpy.ndarray): uint8 images
+
+        Returns:
+            numpy.ndarray: Input tensor in the model's dtype
+        """
+        dtype = self.input_details['dtype']
+        pixels = images.astype(np.float32) / 255.0
+
+        if dtype == np.float32:
+            return pixels
+
+        scale, zero_point = self.input_details['quantization']
+        info = np.iinfo(dtype)
+        return np.clip(np.round(pixels / scale + zero_point), info.min, info.max).astype(dtype)
+
+    def _dequantize_output(self, output):
+        """
+        Convert the model output back to float probabilities.
+
+        Args:
+            output (numpy.ndarray): Raw output tensor
+
+        Returns:
+            numpy.ndarray: Float probabilities
+        """
+        if self.output_details['dtype'] == np.float32:
+            return output
+
+        scale, zero_point = self.output_details['quantization']
+        return (output.astype(np.float32) - zero_point) * scale
+
+    def predict(self, image_path):
+        """
+        Predict whether an image contains a cat or dog.
+
+        Args:
+            image_path (str): Path to the image file
+
+        Returns:
+            tuple: (prediction, confidence)
+        """
+        img = self.load_image(image_path)
+        if img is None:
+            raise ValueError("Could not load image")
+
+        prediction_prob = float(self.predict_proba(img[np.newaxis])[0])
+        prediction = 1 if prediction_prob > 0.5 else 0
+        confidence = prediction_prob if prediction == 1 else 1 - prediction_prob
+
+        class_names = ['Cat', 'Dog']
+        return class_names[prediction], confidence
+
+    def benchmark(self, images, batch_size=32):
+        """
+        Time single-image latency and batched throughput.
+
+        Args:
+            images (numpy.ndarray): uint8 images of shape (n, height, width, channels)
+            batch_size (int): Batch size for the throughput run
+
+        Returns:
+            dict: Latency in milliseconds, throughput in images/sec and size in bytes
+        """
+        self.predict_proba(images[:1])
+
+        start = time.perf_counter()
+        for img in images:
+            self.predict_proba(img[np.newaxis])
+        latency = (time.perf_counter() - start) / len(images)
+
+        start = time.perf_counter()
+        for i in range(0, len(images), batch_size):
+            self.predict_proba(images[i:i + batch_size])
+        throughput = len(images) / (time.perf_counter() - start)
+
+        return {
+            'latency_ms': latency * 1000,
+            'images_per_sec': throughput,
+            'size_bytes': os.path.getsize(self.model_path)
+        }
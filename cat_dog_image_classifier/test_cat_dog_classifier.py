@@ -0,0 +1,82 @@
+"""
+Tests for the cat and dog classifier's tf.data prediction and training paths.
+
+Run with: python -m pytest test_cat_dog_classifier.py
+"""
+
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from cat_dog_classifier import CatDogClassifier
+
+
+@pytest.fixture(scope='module')
+def image_dir(tmp_path_factory):
+    """
+    Write a small directory of synthetic cat and dog images.
+
+    Returns:
+        str: Directory containing 'cats' and 'dogs' subdirectories
+    """
+    data_dir = tmp_path_factory.mktemp('images')
+    rng = np.random.default_rng(0)
+
+    for label in ('cats', 'dogs'):
+        os.makedirs(data_dir / label)
+        for i in range(12):
+            img = rng.integers(0, 256, (48, 48, 3), dtype=np.uint8)
+            cv2.imwrite(str(data_dir / label / f'{i}.jpg'), img)
+
+    return str(data_dir)
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    """
+    Build an untrained classifier on small inputs.
+
+    Returns:
+        CatDogClassifier: Classifier with a compiled model
+    """
+    classifier = CatDogClassifier(input_shape=(64, 64, 3))
+    classifier.model = classifier.build_model()
+    return classifier
+
+
+def test_predict_batch_empty(classifier):
+    assert classifier.predict_batch([]) == []
+
+
+def test_predict_dir_empty(classifier, tmp_path):
+    output_csv = tmp_path / 'predictions.csv'
+
+    stats = classifier.predict_dir(str(tmp_path), str(output_csv))
+
+    assert stats['images'] == 0
+    assert output_csv.read_text().splitlines() == ['path,label,confidence']
+
+
+def test_predict_batch_skips_undecodable(classifier, image_dir, tmp_path):
+    bad_path = tmp_path / 'bad.jpg'
+    bad_path.write_bytes(b'not an image')
+    paths = [os.path.join(image_dir, 'cats', '0.jpg'), str(bad_path)]
+
+    results = classifier.predict_batch(paths)
+
+    assert [path for path, _, _ in results] == paths[:1]
+
+
+def test_profile_streaming_epoch(image_dir):
+    classifier = CatDogClassifier(input_shape=(64, 64, 3))
+    classifier.model = classifier.build_model()
+    # ignore_errors() and filter() leave the dataset with unknown cardinality
+    train_ds, val_ds, _ = classifier.make_datasets(image_dir, batch_size=4)
+
+    classifier.train(train_ds, X_val=val_ds, epochs=1, profile=True)
+
+    (stats,) = classifier.profile
+    assert stats['steps'] > 0
+    assert stats['input_stall_fraction'] is not None
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Linear Regression Health Costs Calculator - Model Artifact
+This script stores a trained MedicalCostPredictor as JSON plus .npy files
+and scores records from it with NumPy only, without importing scikit-learn.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+ARTIFACT_FORMAT_VERSION = 1
+METADATA_NAME = 'model.json'
+COEFFICIENTS_NAME = 'coefficients.npy'
+SCALER_NAME = 'scaler.npy'
+
+
+def write_artifact(directory, metadata, coefficients, scaler_stats):
+    """
+    Write a model artifact directory.
+
+    Args:
+        directory (str): Directory to write, created if needed
+        metadata (dict): Feature columns, category levels and intercept
+        coefficients (numpy.ndarray): Model coefficients on scaled features
+        scaler_stats (numpy.ndarray): Rows of scaler mean, variance and scale
+    """
+    os.makedirs(directory, exist_ok=True)
+    metadata = dict(metadata, format_version=ARTIFACT_FORMAT_VERSION)
+
+    with open(os.path.join(directory, METADATA_NAME), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    np.save(os.path.join(directory, COEFFICIENTS_NAME), np.asarray(coefficients, dtype=np.float64))
+    np.save(os.path.join(directory, SCALER_NAME), np.asarray(scaler_stats, dtype=np.float64))
+
+
+def read_artifact(directory):
+    """
+    Read and validate a model artifact directory.
+
+    Args:
+        directory (str): Directory written by write_artifact()
+
+    Returns:
+        tuple: (metadata dict, coefficients, scaler stats)
+    """
+    with open(os.path.join(directory, METADATA_NAME)) as f:
+        metadata = json.load(f)
+
+    if metadata.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format: {metadata.get('format_version')}")
+
+    coefficients = np.load(os.path.join(directory, COEFFICIENTS_NAME))
+    scaler_stats = np.load(os.path.join(directory, SCALER_NAME))
+
+    n_features = len(metadata['feature_columns'])
+    if coefficients.shape != (n_features,) or scaler_stats.shape != (3, n_features):
+        raise ValueError("Artifact arrays do not match its feature columns")
+
+    return metadata, coefficients, scaler_stats
+
+
+class MedicalCostScorer:
+    """
+    Scores records from an artifact written by MedicalCostPredictor.save_model().
+    """
+
+    def __init__(self, directory):
+        """
+        Load the artifact and fold the scaler into the coefficients.
+
+        Args:
+            directory (str): Artifact directory
+        """
+        metadata, coefficients, scaler_stats = read_artifact(directory)
+        mean, _, scale = scaler_stats
+
+        self.feature_columns = metadata['feature_columns']
+        self.categories = metadata['categories']
+        self.weights = coefficients / scale
+        self.bias = float(metadata['intercept'] - mean @ self.weights)
+
+        # Per-record scoring walks plain Python floats; a category's
+        # contribution is looked up directly instead of encoded then multiplied
+        self._numeric_terms = []
+        self._category_terms = []
+        for col, weight in zip(self.feature_columns, self.weights.tolist()):
+            if col in self.categories:
+                contributions = {level: code * weight for code, level in enumerate(self.categories[col])}
+                self._category_terms.append((col, contributions))
+            else:
+                self._numeric_terms.append((col, weight))
+
+    def predict(self, features):
+        """
+        Predict the medical cost of one record.
+
+        Args:
+            features (dict): Dictionary of feature values; missing features count as 0
+
+        Returns:
+            float: Predicted medical cost
+        """
+        total = self.bias
+        for col, weight in self._numeric_terms:
+            total += weight * features.get(col, 0)
+
+        for col, contributions in self._category_terms:
+            if col in features:
+                try:
+                    total += contributions[features[col]]
+                except KeyError:
+                    raise ValueError(f"Unknown value for '{col}': {features[col]!r}") from None
+
+        return max(total, 0.0)  # Ensure non-negative prediction
+
+    def predict_batch(self, records):
+        """
+        Predict the medical cost of many records in one vectorised pass.
+
+        Args:
+            records (Mapping): Column name -> values, such as a pd.DataFrame
+                or a dict of lists
+
+        Returns:
+            numpy.ndarray: Predicted medical cost per record
+        """
+        n_rows = len(records[next(iter(records))])
+        X = np.zeros((n_rows, len(self.feature_columns)))
+
+        # Missing columns stay 0, as in predict()
+        for i, col in enumerate(self.feature_columns):
+            if col not in records:
+                continue
+
+            if col in self.categories:
+                levels = np.asarray(self.categories[col], dtype=str)
+                values = np.asarray(records[col], dtype=str)
+                # Levels are stored sorted, so a binary search gives the label codes
+                codes = np.minimum(np.searchsorted(levels, values), len(levels) - 1)
+                unknown = levels[codes] != values
+                if unknown.any():
+                    raise ValueError(f"Unknown values for '{col}': {sorted(set(values[unknown].tolist()))}")
+                X[:, i] = codes
+            else:
+                X[:, i] = np.asarray(records[col], dtype=np.float64)
+
+        return np.maximum(X @ self.weights + self.bias, 0)  # Ensure non-negative predictions
+
+
+def main():
+    """
+    Score one record from an artifact and report load and scoring latency.
+    """
+    parser = argparse.ArgumentParser(description='Score a record with a medical cost artifact')
+    parser.add_argument('artifact', help='Directory written by MedicalCostPredictor.save_model()')
+    parser.add_argument('--age', type=float, default=30)
+    parser.add_argument('--sex', default='male')
+    parser.add_argument('--bmi', type=float, default=25.0)
+    parser.add_argument('--children', type=float, default=2)
+    parser.add_argument('--smoker', default='no')
+    parser.add_argument('--region', default='northeast')
+
+    args = parser.parse_args()
+    record = {col: value for col, value in vars(args).items() if col != 'artifact'}
+
+    start = time.perf_counter()
+    scorer = MedicalCostScorer(args.artifact)
+    load_time = time.perf_counter() - start
+
+    n_calls = 10000
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        predicted_cost = scorer.predict(record)
+    latency = (time.perf_counter() - start) / n_calls
+
+    print(f"Record: {record}")
+    print(f"Predicted cost: ${predicted_cost:.2f}")
+    print(f"\nArtifact loaded in {load_time * 1000:.2f}ms, "
+          f"scored in {latency * 1e6:.2f}µs per record")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,18 +13,36 @@ from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from cost_scorer import read_artifact, write_artifact
+
 
 class MedicalCostPredictor:
     """
     A linear regression model to predict medical insurance costs.
     """
 
+    CATEGORICAL_COLUMNS = ['sex', 'smoker', 'region']
+
+    # Smallest dtypes that hold the insurance data; charges stay float64, as
+    # float32 cannot represent every cent above $131,072
+    COLUMN_DTYPES = {
+        'age': 'int8',
+        'sex': 'category',
+        'bmi': 'float32',
+        'children': 'int8',
+        'smoker': 'category',
+        'region': 'category',
+        'charges': 'float64'
+    }
+
     def __init__(self):
         self.model = None
         self.scaler = StandardScaler()
         self.label_encoders = {}
         self.feature_columns = None
         self.target_column = 'charges'
+        # Scaled training rows and target kept by train() for predict_interval()
+        self._bootstrap_rows = None
 
     def load_data(self, filepath):
         """
@@ -36,15 +54,21 @@ class MedicalCostPredictor:
         Returns:
             pd.DataFrame: Preprocessed dataframe
         """
+        # Integer columns are read as nullable so rows with missing values
+        # reach dropna() instead of failing the parse
+        read_dtypes = {col: dtype.capitalize() if dtype.startswith('int') else dtype
+                       for col, dtype in self.COLUMN_DTYPES.items()}
+
         try:
-            df = pd.read_csv(filepath)
+            df = pd.read_csv(filepath, dtype=read_dtypes)
             print(f"Loaded {len(df)} records from {filepath}")
         except FileNotFoundError:
             print(f"File {filepath} not found. Using sample data.")
             df = self._create_sample_data()
 
-        # Store original dataframe for reference
-        self.original_df = df.copy()
+        # Store original dataframe for reference; preprocessing returns new
+        # frames and never modifies it, so no copy is needed
+        self.original_df = df
 
         # Preprocess the data
         df = self._preprocess_data(df)
@@ -108,13 +132,22 @@ class MedicalCostPredictor:
         # Handle missing values
         df = df.dropna()
 
-        # Encode categorical variables
-        categorical_columns = ['sex', 'smoker', 'region']
+        # Compact dtypes; columns load_data() already read compactly are not copied
+        df = df.astype({col: dtype for col, dtype in self.COLUMN_DTYPES.items() if col in df.columns})
+
+        # Encode categorical variables as their category codes, which match
+        # LabelEncoder codes once the categories are sorted
+        codes = {}
+        for col in self.CATEGORICAL_COLUMNS:
+            values = df[col].cat.remove_unused_categories()
+            if not values.cat.categories.is_monotonic_increasing:
+                values = values.cat.reorder_categories(values.cat.categories.sort_values())
 
-        for col in categorical_columns:
             if col not in self.label_encoders:
                 self.label_encoders[col] = LabelEncoder()
-            df[col] = self.label_encoders[col].fit_transform(df[col])
+            self.label_encoders[col].classes_ = values.cat.categories.to_numpy(dtype=object)
+            codes[col] = values.cat.codes
+        df = df.assign(**codes)
 
         # Store feature columns
         self.feature_columns = [col for col in df.columns if col != self.target_column]
@@ -146,6 +179,7 @@ class MedicalCostPredictor:
         # Train the model
         self.model = LinearRegression()
         self.model.fit(X_train_scaled, y_train)
+        self._bootstrap_rows = (X_train_scaled, np.asarray(y_train, dtype=np.float64))
 
         # Make predictions
         y_train_pred = self.model.predict(X_train_scaled)
@@ -178,6 +212,160 @@ class MedicalCostPredictor:
 
         return results
 
+    def train_streaming(self, filepath, chunk_size=500000):
+        """
+        Fit the model in one streaming pass over a CSV file of any size.
+
+        Each chunk adds its contribution to a Gram matrix over an intercept
+        column, the target, the numeric features and one indicator per
+        category level seen so far. Label codes are linear in those
+        indicators, so once the pass ends the sorted category codes are
+        applied to the Gram matrix and the scaler statistics and normal
+        equations are solved from it. Memory is O(columns^2), independent of
+        the number of rows.
+
+        Args:
+            filepath (str): Path to the CSV file
+            chunk_size (int): Number of rows read per chunk
+
+        Returns:
+            dict: Rows used, training RMSE and R^2 computed from the statistics
+        """
+        gram = None
+        indicators = {}
+        offset = None
+        n_rows = 0
+
+        for chunk in pd.read_csv(filepath, chunksize=chunk_size):
+            chunk = chunk.dropna()
+            if self.feature_columns is None:
+                self.feature_columns = [col for col in chunk.columns if col != self.target_column]
+            numeric = [col for col in self.feature_columns if col not in self.CATEGORICAL_COLUMNS]
+
+            # Shift numeric columns by the first chunk's means so the raw
+            # moments do not lose precision to cancellation over many rows
+            if offset is None:
+                offset = chunk[[self.target_column] + numeric].mean().to_numpy(dtype=np.float64)
+
+            design = self._streaming_design(chunk, numeric, indicators, offset)
+
+            # New category levels append columns, so pad the earlier statistics
+            if gram is not None and gram.shape[0] < design.shape[1]:
+                gram = np.pad(gram, (0, design.shape[1] - gram.shape[0]))
+
+            chunk_gram = design.T @ design
+            gram = chunk_gram if gram is None else gram + chunk_gram
+            n_rows += len(chunk)
+
+        if gram is None:
+            raise ValueError(f"No rows found in {filepath}")
+
+        # Columns of D = [1, features, target] are linear in the design: D = Z @ M
+        levels = {col: sorted(level for c, level in indicators if c == col)
+                  for col in self.CATEGORICAL_COLUMNS if col in self.feature_columns}
+        mapping = np.zeros((gram.shape[0], len(self.feature_columns) + 2))
+        mapping[0, 0] = 1
+        mapping[1, -1] = 1
+        for j, col in enumerate(self.feature_columns, start=1):
+            if col in levels:
+                for code, level in enumerate(levels[col]):
+                    mapping[indicators[(col, level)], j] = code
+            else:
+                mapping[2 + numeric.index(col), j] = 1
+
+        moments = mapping.T @ gram @ mapping / n_rows
+        mean = moments[0, 1:]
+        covariance = moments[1:, 1:] - np.outer(mean, mean)
+
+        # Undo the shift on the means; the covariance is unaffected by it
+        mean = mean.copy()
+        mean[-1] += offset[0]
+        for i, col in enumerate(numeric, start=1):
+            mean[self.feature_columns.index(col)] += offset[i]
+        feature_cov, target_cov = covariance[:-1, :-1], covariance[:-1, -1]
+
+        # Centred normal equations give the slopes on unscaled features
+        slopes = np.linalg.lstsq(feature_cov, target_cov, rcond=None)[0]
+        residual_var = covariance[-1, -1] - 2 * slopes @ target_cov + slopes @ feature_cov @ slopes
+
+        self._set_fitted_state(levels, mean[:-1], np.diag(feature_cov).copy(), slopes, mean[-1], n_rows)
+        self._bootstrap_rows = None
+
+        return {
+            'rows': n_rows,
+            'train_rmse': float(np.sqrt(max(residual_var, 0))),
+            'train_r2': float(1 - residual_var / covariance[-1, -1])
+        }
+
+    def _streaming_design(self, chunk, numeric, indicators, offset):
+        """
+        Build one chunk's design matrix for train_streaming().
+
+        Columns are [1, target, numeric features, category indicators], with
+        indicator columns numbered in the order their levels first appear.
+
+        Args:
+            chunk (pd.DataFrame): Raw rows
+            numeric (list): Numeric feature columns
+            indicators (dict): (column, level) -> design column, extended in place
+            offset (numpy.ndarray): Shift subtracted from the target and numeric columns
+
+        Returns:
+            numpy.ndarray: float64 design matrix
+        """
+        categorical = [col for col in self.feature_columns if col in self.CATEGORICAL_COLUMNS]
+        for col in categorical:
+            for level in pd.unique(chunk[col]):
+                indicators.setdefault((col, level), 2 + len(numeric) + len(indicators))
+
+        design = np.zeros((len(chunk), 2 + len(numeric) + len(indicators)))
+        design[:, 0] = 1
+        design[:, 1:2 + len(numeric)] = chunk[[self.target_column] + numeric].to_numpy(dtype=np.float64) - offset
+
+        rows = np.arange(len(chunk))
+        for col in categorical:
+            col_levels = [level for c, level in indicators if c == col]
+            col_positions = np.array([indicators[(col, level)] for level in col_levels])
+            codes = pd.Categorical(chunk[col], categories=col_levels).codes
+            design[rows, col_positions[codes]] = 1
+
+        return design
+
+    def _set_fitted_state(self, levels, mean, var, slopes, target_mean, n_rows):
+        """
+        Store streamed statistics as a fitted scaler, model and label encoders.
+
+        Args:
+            levels (dict): Sorted category levels per categorical column
+            mean (numpy.ndarray): Feature means
+            var (numpy.ndarray): Feature variances
+            slopes (numpy.ndarray): Coefficients on unscaled features
+            target_mean (float): Mean of the target
+            n_rows (int): Number of rows the statistics cover
+        """
+        for col, classes in levels.items():
+            self.label_encoders[col] = LabelEncoder()
+            self.label_encoders[col].classes_ = np.array(classes, dtype=object)
+
+        feature_names = np.array(self.feature_columns, dtype=object)
+
+        # Same attributes StandardScaler.fit() sets; constant features keep scale 1
+        scale = np.sqrt(var)
+        scale[scale == 0] = 1.0
+        self.scaler = StandardScaler()
+        self.scaler.mean_ = mean
+        self.scaler.var_ = var
+        self.scaler.scale_ = scale
+        self.scaler.n_samples_seen_ = n_rows
+        self.scaler.n_features_in_ = len(feature_names)
+        self.scaler.feature_names_in_ = feature_names
+
+        # On standardised features the intercept is the target mean
+        self.model = LinearRegression()
+        self.model.coef_ = slopes * scale
+        self.model.intercept_ = target_mean
+        self.model.n_features_in_ = len(feature_names)
+
     def predict(self, features):
         """
         Make a prediction for new data.
@@ -214,6 +402,187 @@ class MedicalCostPredictor:
 
         return max(prediction, 0)  # Ensure non-negative prediction
 
+    def predict_batch(self, df, use_sklearn=False):
+        """
+        Make predictions for many records in one vectorised pass.
+
+        Args:
+            df (pd.DataFrame): Records with the same columns predict() accepts
+            use_sklearn (bool): Go through the fitted scaler and model instead
+                of the folded NumPy matmul
+
+        Returns:
+            numpy.ndarray: Predicted medical cost per record
+        """
+        if self.model is None:
+            raise ValueError("Model not trained yet")
+
+        X = self._encode_features(df)
+
+        if use_sklearn:
+            X = pd.DataFrame(X, columns=self.feature_columns)
+            predictions = self.model.predict(self.scaler.transform(X))
+        else:
+            weights, bias = self._folded_coefficients()
+            predictions = X @ weights + bias
+
+        return np.maximum(predictions, 0)  # Ensure non-negative predictions
+
+    def predict_interval(self, df, n_boot=200, confidence=0.95, include_noise=True,
+                         random_state=42, max_batch_bytes=64 * 2**20):
+        """
+        Bootstrap prediction intervals for many records at once.
+
+        The linear fit is repeated on n_boot resamples of the training rows.
+        Each resample is a vector of row counts, so a batch of resamples
+        reduces to one matrix product giving a stack of weighted Gram
+        matrices, which are solved together. Runtime grows with
+        n_boot * training rows and not with the number of sklearn fits.
+
+        Args:
+            df (pd.DataFrame): Records with the same columns predict() accepts
+            n_boot (int): Number of bootstrap refits
+            confidence (float): Coverage of the interval
+            include_noise (bool): Add resampled training residuals, giving an
+                interval for new observations rather than for the mean cost
+            random_state (int): Random seed
+            max_batch_bytes (int): Memory budget for the resample counts
+
+        Returns:
+            pd.DataFrame: 'prediction', 'lower' and 'upper' per record
+        """
+        if self.model is None:
+            raise ValueError("Model not trained yet")
+        if self._bootstrap_rows is None:
+            raise ValueError("Bootstrap intervals need the training rows. Call train() first.")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1")
+
+        X_train, y_train = self._bootstrap_rows
+        n_rows = len(y_train)
+        design = np.column_stack([np.ones(n_rows), X_train])
+        n_terms = design.shape[1]
+        rng = np.random.default_rng(random_state)
+
+        boot_coefs = np.empty((n_boot, n_terms))
+        batch_size = max(1, min(n_boot, max_batch_bytes // (8 * n_rows)))
+        for start in range(0, n_boot, batch_size):
+            size = min(batch_size, n_boot - start)
+            counts = rng.multinomial(n_rows, np.full(n_rows, 1.0 / n_rows), size=size).astype(np.float64)
+
+            # A resample's normal equations are its row counts times the
+            # per-row outer products and target moments
+            grams = np.zeros((size, n_terms * n_terms))
+            targets = np.zeros((size, n_terms))
+            for row in range(0, n_rows, 65536):
+                block = slice(row, row + 65536)
+                rows = design[block]
+                grams += counts[:, block] @ (rows[:, :, None] * rows[:, None, :]).reshape(len(rows), -1)
+                targets += counts[:, block] @ (rows * y_train[block, None])
+            grams = grams.reshape(size, n_terms, n_terms)
+            # pinv keeps resamples that miss a rare category level solvable
+            boot_coefs[start:start + size] = (np.linalg.pinv(grams) @ targets[:, :, None])[:, :, 0]
+
+        X = self._encode_features(df)
+        X_scaled = (X - self.scaler.mean_) / self.scaler.scale_
+        predictions = boot_coefs[:, 0] + X_scaled @ boot_coefs[:, 1:].T
+
+        if include_noise:
+            residuals = y_train - self.model.predict(X_train)
+            predictions += residuals[rng.integers(0, n_rows, predictions.shape)]
+
+        tail = (1 - confidence) / 2
+        lower, upper = np.quantile(predictions, [tail, 1 - tail], axis=1)
+
+        return pd.DataFrame({
+            'prediction': self.predict_batch(df),
+            'lower': np.maximum(lower, 0),
+            'upper': np.maximum(upper, 0)
+        }, index=df.index)
+
+    def _encode_features(self, df):
+        """
+        Encode categorical columns and order features like the training data.
+
+        Args:
+            df (pd.DataFrame): Raw records
+
+        Returns:
+            numpy.ndarray: float64 feature matrix in feature_columns order
+        """
+        X = np.zeros((len(df), len(self.feature_columns)))
+
+        # Missing columns stay 0, as in predict()
+        for i, col in enumerate(self.feature_columns):
+            if col not in df.columns:
+                continue
+
+            values = df[col]
+            encoder = self.label_encoders.get(col)
+            if encoder is not None:
+                codes = pd.Categorical(values, categories=encoder.classes_).codes
+                if (codes == -1).any():
+                    unknown = sorted(set(values[codes == -1].astype(str)))
+                    raise ValueError(f"Unknown values for '{col}': {unknown}")
+                values = codes
+            X[:, i] = values
+
+        return X
+
+    def _folded_coefficients(self):
+        """
+        Fold the scaler into the linear model's coefficients.
+
+        Scaling then predicting is ((X - mean) / scale) @ coef + intercept,
+        which equals X @ (coef / scale) + (intercept - mean @ (coef / scale)).
+
+        Returns:
+            tuple: (weights, bias) applied directly to unscaled features
+        """
+        weights = self.model.coef_ / self.scaler.scale_
+        bias = self.model.intercept_ - self.scaler.mean_ @ weights
+        return weights, bias
+
+    def save_model(self, directory):
+        """
+        Save the trained model as a compact JSON and .npy artifact.
+
+        The artifact can be scored with cost_scorer.MedicalCostScorer,
+        which does not need scikit-learn.
+
+        Args:
+            directory (str): Directory to write the artifact to
+        """
+        if self.model is None:
+            raise ValueError("No model to save")
+
+        metadata = {
+            'feature_columns': list(self.feature_columns),
+            'target_column': self.target_column,
+            'categories': {col: encoder.classes_.tolist() for col, encoder in self.label_encoders.items()},
+            'intercept': float(self.model.intercept_),
+            'n_samples': int(self.scaler.n_samples_seen_)
+        }
+        scaler_stats = np.vstack([self.scaler.mean_, self.scaler.var_, self.scaler.scale_])
+
+        write_artifact(directory, metadata, self.model.coef_, scaler_stats)
+
+    def load_model(self, directory):
+        """
+        Load a model saved with save_model().
+
+        Args:
+            directory (str): Artifact directory
+        """
+        metadata, coefficients, scaler_stats = read_artifact(directory)
+        mean, var, scale = scaler_stats
+
+        self.feature_columns = metadata['feature_columns']
+        self.target_column = metadata['target_column']
+        self._set_fitted_state(metadata['categories'], mean, var, coefficients / scale,
+                               metadata['intercept'], metadata['n_samples'])
+        self._bootstrap_rows = None
+
     def get_feature_importance(self):
         """
         Get feature importance based on coefficients.
@@ -325,8 +694,7 @@ def main():
     print("\nTraining the model...")
     results = predictor.train(X, y)
 
-    print("
-Model Performance:")
+    print("\nModel Performance:")
     print(f"Test MAE: ${results['test_mae']:.2f}")
     print(f"Test RMSE: ${results['test_rmse']:.2f}")
     print(f"Train R²: {results['train_r2']:.4f}")
@@ -351,7 +719,7 @@ Model Performance:")
 
     predicted_cost = predictor.predict(sample_patient)
     print(f"Sample patient: {sample_patient}")
-    print(".2f")
+    print(f"Predicted cost: ${predicted_cost:.2f}")
 
     print("\n" + "=" * 50)
     print("Model training and evaluation complete!")
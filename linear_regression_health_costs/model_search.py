@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Linear Regression Health Costs Calculator - Model Search
+This script runs k-fold cross-validation over linear, ridge, lasso and
+polynomial-feature variants on a process pool, sharing the encoded data
+with the workers through shared memory.
+"""
+
+import argparse
+import itertools
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures, StandardScaler
+
+from medical_cost_predictor import MedicalCostPredictor
+
+MODEL_TYPES = ('linear', 'ridge', 'lasso')
+DEGREES = (1, 2, 3)
+ALPHAS = (0.01, 0.1, 1.0, 10.0, 100.0)
+
+# Arrays attached by each worker process in _attach_shared()
+_shared = {}
+
+
+def build_candidates(search='grid', n_iter=20, seed=42):
+    """
+    Build the candidate configurations to evaluate.
+
+    Args:
+        search (str): 'grid' for every combination, 'random' for a sample
+        n_iter (int): Number of candidates drawn by random search
+        seed (int): Random seed for random search
+
+    Returns:
+        list: Candidate dictionaries with 'model', 'degree' and 'alpha' keys
+    """
+    if search == 'grid':
+        candidates = [{'model': 'linear', 'degree': degree, 'alpha': None} for degree in DEGREES]
+        for model, degree, alpha in itertools.product(MODEL_TYPES[1:], DEGREES, ALPHAS):
+            candidates.append({'model': model, 'degree': degree, 'alpha': alpha})
+        return candidates
+
+    if search == 'random':
+        # Alphas are drawn log-uniformly over the range the grid covers
+        rng = np.random.default_rng(seed)
+        candidates = []
+        for _ in range(n_iter):
+            model = MODEL_TYPES[rng.integers(len(MODEL_TYPES))]
+            alpha = None if model == 'linear' else float(10 ** rng.uniform(-2, 2))
+            candidate = {'model': model, 'degree': int(rng.choice(DEGREES)), 'alpha': alpha}
+            if candidate not in candidates:
+                candidates.append(candidate)
+        return candidates
+
+    raise ValueError(f"Unknown search '{search}'. Choose 'grid' or 'random'")
+
+
+def build_pipeline(candidate):
+    """
+    Build the scikit-learn pipeline for a candidate.
+
+    Args:
+        candidate (dict): Candidate from build_candidates()
+
+    Returns:
+        sklearn.pipeline.Pipeline: Unfitted pipeline
+    """
+    if candidate['model'] == 'ridge':
+        model = Ridge(alpha=candidate['alpha'])
+    elif candidate['model'] == 'lasso':
+        # With many more rows than columns, coordinate descent on the Gram matrix is far cheaper
+        model = Lasso(alpha=candidate['alpha'], max_iter=10000, precompute=True)
+    else:
+        model = LinearRegression()
+
+    steps = []
+    if candidate['degree'] > 1:
+        steps.append(PolynomialFeatures(candidate['degree'], include_bias=False))
+    steps.extend([StandardScaler(), model])
+
+    return make_pipeline(*steps)
+
+
+def _share_array(array):
+    """
+    Copy an array into a new shared memory block.
+
+    Args:
+        array (numpy.ndarray): Array to share
+
+    Returns:
+        tuple: (SharedMemory, (name, shape, dtype) spec for _attach_shared)
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _attach_shared(specs):
+    """
+    Worker initializer: map the shared arrays without copying them.
+
+    Args:
+        specs (dict): Array name -> (shared memory name, shape, dtype)
+    """
+    for key, (name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        # Keep the block referenced so its buffer stays mapped
+        _shared[key] = (block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf))
+
+
+def _evaluate_fold(task):
+    """
+    Fit one candidate on one fold of the shared data.
+
+    Args:
+        task (tuple): (candidate index, candidate, fold number)
+
+    Returns:
+        tuple: (candidate index, fold number, fit time in seconds, test RMSE,
+            whether the solver converged)
+    """
+    candidate_id, candidate, fold = task
+    X, y, folds = _shared['X'][1], _shared['y'][1], _shared['folds'][1]
+
+    test = folds == fold
+    pipeline = build_pipeline(candidate)
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', ConvergenceWarning)
+        start = time.perf_counter()
+        pipeline.fit(X[~test], y[~test])
+        fit_time = time.perf_counter() - start
+
+    converged = not any(issubclass(w.category, ConvergenceWarning) for w in caught)
+    errors = pipeline.predict(X[test]) - y[test]
+    return candidate_id, fold, fit_time, float(np.sqrt(np.mean(errors ** 2))), converged
+
+
+def cross_validate_search(X, y, candidates, n_splits=5, n_jobs=None, seed=42):
+    """
+    Cross-validate every candidate, running folds in parallel.
+
+    The encoded features, target and fold assignment are written to shared
+    memory once, and each task only carries a candidate and a fold number.
+    Scaling and polynomial expansion are fitted inside each training fold.
+
+    Args:
+        X (pd.DataFrame): Encoded feature matrix
+        y (pd.Series): Target variable
+        candidates (list): Candidates from build_candidates()
+        n_splits (int): Number of folds
+        n_jobs (int): Number of worker processes (default: CPU count, 1 runs in-process)
+        seed (int): Random seed for the fold assignment
+
+    Returns:
+        pd.DataFrame: One row per candidate, sorted by mean RMSE
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    if n_splits < 2 or n_splits > len(y):
+        raise ValueError(f"n_splits must be between 2 and {len(y)}")
+
+    # Shuffled fold assignment with near-equal fold sizes
+    rng = np.random.default_rng(seed)
+    folds = (rng.permutation(len(y)) % n_splits).astype(np.int16)
+
+    tasks = [(i, candidate, fold) for i, candidate in enumerate(candidates) for fold in range(n_splits)]
+    n_jobs = n_jobs or os.cpu_count()
+
+    blocks, specs = [], {}
+    try:
+        for key, array in (('X', X), ('y', y), ('folds', folds)):
+            block, specs[key] = _share_array(array)
+            blocks.append(block)
+
+        if n_jobs == 1:
+            _attach_shared(specs)
+            try:
+                results = [_evaluate_fold(task) for task in tasks]
+            finally:
+                # Drop the array views before closing, or close() fails
+                attached = [block for block, _ in _shared.values()]
+                _shared.clear()
+                for block in attached:
+                    block.close()
+        else:
+            with ProcessPoolExecutor(n_jobs, initializer=_attach_shared, initargs=(specs,)) as pool:
+                results = list(pool.map(_evaluate_fold, tasks, chunksize=max(1, len(tasks) // (4 * n_jobs))))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    scores = pd.DataFrame(results, columns=['candidate', 'fold', 'fit_time', 'rmse', 'converged'])
+    summary = scores.groupby('candidate').agg(
+        mean_rmse=('rmse', 'mean'),
+        std_rmse=('rmse', 'std'),
+        mean_fit_time=('fit_time', 'mean'),
+        total_fit_time=('fit_time', 'sum'),
+        converged=('converged', 'all')
+    )
+
+    report = pd.DataFrame(candidates).join(summary)
+    return report.sort_values('mean_rmse').reset_index(drop=True)
+
+
+def main():
+    """
+    Run a cross-validated model search on the insurance data.
+    """
+    parser = argparse.ArgumentParser(description='Cross-validated model search for medical costs')
+    parser.add_argument('--data', default='insurance.csv',
+                        help='Path to the insurance CSV file (default: insurance.csv)')
+    parser.add_argument('--search', choices=['grid', 'random'], default='grid',
+                        help='Search strategy (default: grid)')
+    parser.add_argument('--n-iter', type=int, default=20,
+                        help='Candidates drawn by random search (default: 20)')
+    parser.add_argument('--folds', type=int, default=5,
+                        help='Number of cross-validation folds (default: 5)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Number of worker processes (default: CPU count)')
+
+    args = parser.parse_args()
+
+    predictor = MedicalCostPredictor()
+    df = predictor.load_data(args.data)
+    X = df[predictor.feature_columns]
+    y = df[predictor.target_column]
+
+    candidates = build_candidates(args.search, args.n_iter)
+    print(f"\nEvaluating {len(candidates)} candidates with {args.folds}-fold cross-validation...")
+
+    start = time.perf_counter()
+    report = cross_validate_search(X, y, candidates, n_splits=args.folds, n_jobs=args.jobs)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'model':<8} {'degree':>6} {'alpha':>9} {'RMSE':>11} {'std':>9} {'fit ms':>9}")
+    for row in report.itertuples():
+        alpha = '-' if pd.isna(row.alpha) else f"{row.alpha:.4g}"
+        note = '' if row.converged else '  (did not converge)'
+        print(f"{row.model:<8} {row.degree:>6} {alpha:>9} {row.mean_rmse:>11.2f}"
+              f" {row.std_rmse:>9.2f} {row.mean_fit_time * 1000:>9.2f}{note}")
+
+    best = report.iloc[0]
+    print(f"\nBest: {best['model']} (degree {best['degree']}) with RMSE ${best['mean_rmse']:.2f}")
+    print(f"Search finished in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Neural Network SMS Text Classifier - Model Bundle
+This script stores a trained SMSClassifier as a single file and scores
+messages from it, importing TensorFlow only when the first batch is scored.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from sms_text import CLEANING_CONFIG, VocabularyEncoder, clean_text_series
+
+BUNDLE_FORMAT_VERSION = 1
+METADATA_NAME = 'metadata.json'
+MODEL_NAME = 'model.keras'
+
+
+def write_bundle(filepath, model_path, metadata):
+    """
+    Write a bundle file from a saved Keras model and its metadata.
+
+    Args:
+        filepath (str): Path of the bundle to write
+        model_path (str): Path of the saved .keras model
+        metadata (dict): Vocabulary, label classes and encoding settings
+    """
+    metadata = dict(metadata, format_version=BUNDLE_FORMAT_VERSION, cleaning=CLEANING_CONFIG)
+
+    with zipfile.ZipFile(filepath, 'w') as bundle:
+        bundle.writestr(METADATA_NAME, json.dumps(metadata), compress_type=zipfile.ZIP_DEFLATED)
+        # The .keras file is already a zip archive, so store it as is
+        bundle.write(model_path, MODEL_NAME, compress_type=zipfile.ZIP_STORED)
+
+
+def read_metadata(filepath):
+    """
+    Read and validate the metadata of a bundle without touching the model.
+
+    Args:
+        filepath (str): Path of the bundle
+
+    Returns:
+        dict: Bundle metadata
+    """
+    with zipfile.ZipFile(filepath) as bundle:
+        metadata = json.loads(bundle.read(METADATA_NAME))
+
+    if metadata.get('format_version') != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format: {metadata.get('format_version')}")
+    if metadata.get('cleaning') != CLEANING_CONFIG:
+        raise ValueError("Bundle was saved with a different text cleaning configuration")
+
+    return metadata
+
+
+def load_bundle_model(filepath):
+    """
+    Load the Keras model stored in a bundle.
+
+    Args:
+        filepath (str): Path of the bundle
+
+    Returns:
+        keras.Model: The trained model
+    """
+    from tensorflow import keras
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        with zipfile.ZipFile(filepath) as bundle:
+            model_path = bundle.extract(MODEL_NAME, tmp_dir)
+        return keras.models.load_model(model_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class SMSBundle:
+    """
+    Scores messages from a bundle written by SMSClassifier.save_bundle().
+    """
+
+    def __init__(self, filepath):
+        """
+        Load the bundle metadata; the model is loaded on first inference.
+
+        Args:
+            filepath (str): Path of the bundle
+        """
+        self.filepath = filepath
+        metadata = read_metadata(filepath)
+
+        self.max_len = metadata['max_len']
+        self.class_names = np.array(metadata['label_classes'], dtype=object)
+        self.encoder = VocabularyEncoder.from_vocabulary(
+            metadata['vocabulary'], metadata['max_words'], metadata['max_len'], metadata['oov_token']
+        )
+        self._inference_fn = None
+
+    def _get_inference_fn(self):
+        """
+        Import TensorFlow, load the model and compile its inference function.
+
+        Returns:
+            tf.types.experimental.GenericFunction: Function mapping int32
+                sequences to spam probabilities
+        """
+        if self._inference_fn is None:
+            import tensorflow as tf
+
+            model = load_bundle_model(self.filepath)
+
+            @tf.function(input_signature=[tf.TensorSpec((None, self.max_len), tf.int32)])
+            def infer(sequences):
+                return model(sequences, training=False)
+
+            self._inference_fn = infer
+
+        return self._inference_fn
+
+    def predict_proba(self, messages, batch_size=8192):
+        """
+        Get the spam probability of many messages.
+
+        Args:
+            messages (list): Raw SMS messages
+            batch_size (int): Number of messages per inference call
+
+        Returns:
+            numpy.ndarray: Probability of the positive class per message
+        """
+        sequences = self.encoder.transform(clean_text_series(pd.Series(list(messages), dtype=object)))
+        infer = self._get_inference_fn()
+
+        probabilities = np.empty(len(sequences), dtype=np.float32)
+        for start in range(0, len(sequences), batch_size):
+            batch = sequences[start:start + batch_size]
+            probabilities[start:start + len(batch)] = infer(batch).numpy().ravel()
+
+        return probabilities
+
+    def predict_batch(self, messages, batch_size=8192):
+        """
+        Predict whether each of many messages is spam or ham.
+
+        Args:
+            messages (list): Raw SMS messages
+            batch_size (int): Number of messages per inference call
+
+        Returns:
+            list: (prediction, confidence) tuples in input order
+        """
+        probabilities = self.predict_proba(messages, batch_size)
+        predictions = (probabilities > 0.5).astype(int)
+        confidences = np.where(predictions == 1, probabilities, 1 - probabilities)
+
+        return list(zip(self.class_names[predictions], confidences.tolist()))
+
+    def predict(self, message):
+        """
+        Predict whether a message is spam or ham.
+
+        Args:
+            message (str): SMS message to classify
+
+        Returns:
+            tuple: (prediction, confidence)
+        """
+        return self.predict_batch([message])[0]
+
+
+def main():
+    """
+    Score messages from a bundle and report start-up and scoring times.
+    """
+    parser = argparse.ArgumentParser(description='Score SMS messages with a model bundle')
+    parser.add_argument('bundle', help='Path to a bundle written by SMSClassifier.save_bundle()')
+    parser.add_argument('messages', nargs='+', help='Messages to classify')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    bundle = SMSBundle(args.bundle)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictions = bundle.predict_batch(args.messages)
+    score_time = time.perf_counter() - start
+
+    for message, (prediction, confidence) in zip(args.messages, predictions):
+        print(f"{prediction}\t{confidence:.3f}\t{message}")
+
+    print(f"\nBundle opened in {load_time * 1000:.1f}ms, "
+          f"first batch scored in {score_time:.2f}s ({os.path.basename(args.bundle)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,35 +11,66 @@ from tensorflow import keras
 from tensorflow.keras import layers
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, log_loss
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+import joblib
 import matplotlib.pyplot as plt
 import seaborn as sns
-import re
-from collections import Counter
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
+from concurrent.futures import ProcessPoolExecutor
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import PorterStemmer
 
+from sms_text import (
+    NON_LETTER_PATTERN, VocabularyEncoder, _clean_text_chunk, clean_text_series, clean_text_tensor
+)
+import sms_bundle
+
+
+# Register the in-graph cleaner so saved text models load without extra setup
+keras.utils.register_keras_serializable(package='sms_classifier')(clean_text_tensor)
+
 
 class SMSClassifier:
     """
     A neural network classifier for SMS spam detection.
+
+    With engine='linear' the same pipeline trains a logistic-regression SGD
+    model on hashed word and bigram features instead.
     """
 
-    def __init__(self, max_words=5000, max_len=100):
+    ENGINES = ('neural', 'linear')
+
+    def __init__(self, max_words=5000, max_len=100, engine='neural', n_features=2 ** 18):
         """
         Initialize the SMS classifier.
 
         Args:
             max_words (int): Maximum number of words in vocabulary
             max_len (int): Maximum length of sequences
+            engine (str): 'neural' for the Keras model or 'linear' for the
+                sparse SGD model
+            n_features (int): Number of hashed features for the linear engine
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'. Choose from: {', '.join(self.ENGINES)}")
+
         self.max_words = max_words
         self.max_len = max_len
+        self.engine = engine
+        self.n_features = n_features
         self.model = None
         self.tokenizer = None
         self.label_encoder = LabelEncoder()
         self.history = None
+        self._inference_fn = None
 
     def load_data(self, filepath):
         """
@@ -108,7 +139,7 @@ class SMSClassifier:
         df = df.drop_duplicates(subset=['message'])
 
         # Clean text
-        df['clean_message'] = df['message'].apply(self._clean_text)
+        df['clean_message'] = self.clean_texts(df['message'])
 
         # Encode labels
         df['label_encoded'] = self.label_encoder.fit_transform(df['label'])
@@ -129,24 +160,58 @@ class SMSClassifier:
         text = text.lower()
 
         # Remove special characters and numbers
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = NON_LETTER_PATTERN.sub('', text)
 
         # Remove extra whitespace
         text = ' '.join(text.split())
 
         return text
 
+    def clean_texts(self, texts, n_jobs=1, chunk_size=100000):
+        """
+        Clean many messages at once with the same result as _clean_text.
+
+        Args:
+            texts: Raw messages (list or pd.Series)
+            n_jobs (int): Number of worker processes; above 1 the messages
+                are cleaned in chunks on a process pool
+            chunk_size (int): Number of messages per chunk in parallel mode
+
+        Returns:
+            pd.Series: Cleaned messages, aligned with the input
+        """
+        texts = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+
+        if n_jobs <= 1 or len(texts) <= chunk_size:
+            return clean_text_series(texts)
+
+        chunks = [texts.iloc[i:i + chunk_size].tolist() for i in range(0, len(texts), chunk_size)]
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            cleaned = [text for chunk in executor.map(_clean_text_chunk, chunks) for text in chunk]
+
+        return pd.Series(cleaned, index=texts.index, dtype=object)
+
     def build_tokenizer(self, texts):
         """
         Build and fit the tokenizer.
 
+        The linear engine hashes words and bigrams, which needs no fitting.
+
         Args:
             texts: List of text messages
         """
-        from tensorflow.keras.preprocessing.text import Tokenizer
-
-        self.tokenizer = Tokenizer(num_words=self.max_words, oov_token='<OOV>')
-        self.tokenizer.fit_on_texts(texts)
+        if self.engine == 'linear':
+            self.tokenizer = HashingVectorizer(
+                n_features=self.n_features,
+                token_pattern=r'[a-z]+',
+                lowercase=False,
+                ngram_range=(1, 2),
+                alternate_sign=False
+            )
+            return
+
+        self.tokenizer = VocabularyEncoder(max_words=self.max_words, max_len=self.max_len)
+        self.tokenizer.fit(texts)
 
     def texts_to_sequences(self, texts):
         """
@@ -156,19 +221,39 @@ class SMSClassifier:
             texts: List of text messages
 
         Returns:
-            numpy.ndarray: Padded sequences
+            numpy.ndarray: Padded int32 sequences, or a sparse feature matrix
+                for the linear engine
+        """
+        return self.tokenizer.transform(texts)
+
+    def build_text_model(self):
         """
-        from tensorflow.keras.preprocessing.sequence import pad_sequences
+        Wrap the trained model so it scores raw message strings.
 
-        sequences = self.tokenizer.texts_to_sequences(texts)
-        padded_sequences = pad_sequences(sequences, maxlen=self.max_len, padding='post', truncating='post')
+        Cleaning and encoding run inside the graph through the tokenizer's
+        TextVectorization export, so the returned model needs no Python
+        preprocessing.
+
+        Returns:
+            keras.Model: Model mapping raw strings to spam probabilities
+        """
+        if self.model is None or self.tokenizer is None:
+            raise ValueError("Model not trained yet")
+        if self.engine != 'neural':
+            raise ValueError("build_text_model() needs the neural engine")
 
-        return padded_sequences
+        inputs = keras.Input(shape=(), dtype='string')
+        sequences = self.tokenizer.to_text_vectorization()(inputs)
+        return keras.Model(inputs, self.model(sequences))
 
     def build_model(self):
         """
         Build the neural network model.
         """
+        if self.engine == 'linear':
+            self.model = SGDClassifier(loss='log_loss', alpha=1e-6, random_state=42)
+            return self.model
+
         model = keras.Sequential([
             layers.Embedding(self.max_words, 128, input_length=self.max_len),
             layers.GlobalAveragePooling1D(),
@@ -187,9 +272,10 @@ class SMSClassifier:
         )
 
         self.model = model
+        self._inference_fn = None
         return model
 
-    def train(self, X, y, validation_split=0.2, epochs=10, batch_size=32):
+    def train(self, X, y, validation_split=0.2, epochs=10, batch_size=32, chunk_size=10000):
         """
         Train the neural network model.
 
@@ -199,6 +285,7 @@ class SMSClassifier:
             validation_split (float): Fraction for validation
             epochs (int): Number of training epochs
             batch_size (int): Batch size
+            chunk_size (int): Rows per partial_fit call for the linear engine
 
         Returns:
             History: Training history
@@ -206,6 +293,10 @@ class SMSClassifier:
         if self.model is None:
             self.build_model()
 
+        if self.engine == 'linear':
+            self.history = self._train_linear(X, y, validation_split, epochs, chunk_size)
+            return self.history
+
         # Add early stopping
         early_stopping = keras.callbacks.EarlyStopping(
             monitor='val_loss',
@@ -225,6 +316,277 @@ class SMSClassifier:
 
         return self.history
 
+    def _train_linear(self, X, y, validation_split, epochs, chunk_size):
+        """
+        Train the linear engine with partial_fit over chunks of rows.
+
+        Args:
+            X: Sparse feature matrix
+            y: Target labels
+            validation_split (float): Fraction held out for validation
+            epochs (int): Number of passes over the training rows
+            chunk_size (int): Rows per partial_fit call
+
+        Returns:
+            SimpleNamespace: Object with a Keras-style history dict
+        """
+        y = np.asarray(y)
+        n_train = int(X.shape[0] * (1 - validation_split))
+        X_train, y_train = X[:n_train], y[:n_train]
+        X_val, y_val = X[n_train:], y[n_train:]
+        classes = np.arange(len(self.label_encoder.classes_))
+
+        history = {'loss': [], 'accuracy': [], 'val_loss': [], 'val_accuracy': []}
+        rng = np.random.default_rng(42)
+
+        for epoch in range(epochs):
+            order = rng.permutation(n_train)
+            for start in range(0, n_train, chunk_size):
+                rows = order[start:start + chunk_size]
+                self.model.partial_fit(X_train[rows], y_train[rows], classes=classes)
+
+            for prefix, X_part, y_part in (('', X_train, y_train), ('val_', X_val, y_val)):
+                if X_part.shape[0] == 0:
+                    continue
+                proba = self.model.predict_proba(X_part)
+                history[prefix + 'loss'].append(log_loss(y_part, proba, labels=classes))
+                history[prefix + 'accuracy'].append(accuracy_score(y_part, proba.argmax(axis=1)))
+
+            print(f"Epoch {epoch + 1}/{epochs} - loss: {history['loss'][-1]:.4f} "
+                  f"- accuracy: {history['accuracy'][-1]:.4f}")
+
+        return SimpleNamespace(history=history)
+
+    def _iter_csv_chunks(self, filepath, message_column, label_column, chunk_size, encoding):
+        """
+        Stream a labelled CSV file as cleaned message chunks.
+
+        Args:
+            filepath (str): Path to the CSV file
+            message_column (str): Column holding the message text
+            label_column (str): Column holding the labels
+            chunk_size (int): Number of rows read per chunk
+            encoding (str): Encoding of the file
+
+        Yields:
+            tuple: (pd.Series of cleaned messages, pd.Series of labels)
+        """
+        reader = pd.read_csv(
+            filepath,
+            usecols=[label_column, message_column],
+            dtype={label_column: str, message_column: str},
+            encoding=encoding,
+            chunksize=chunk_size
+        )
+
+        for chunk in reader:
+            chunk = chunk.dropna(subset=[label_column])
+            yield self.clean_texts(chunk[message_column]), chunk[label_column]
+
+    @staticmethod
+    def _validation_rows(rows, validation_split, seed=42):
+        """
+        Decide which rows are held out for validation.
+
+        Each row index is hashed (SplitMix64) to a fixed pseudo-random number,
+        so every epoch sees the same split without holding any index in
+        memory, and files sorted by label are still split evenly.
+
+        Args:
+            rows (numpy.ndarray): Row indices
+            validation_split (float): Fraction of rows held out for validation
+            seed (int): Seed mixed into the hash
+
+        Returns:
+            numpy.ndarray: Boolean mask, True for validation rows
+        """
+        z = rows.astype(np.uint64) + np.uint64(seed * 0x9E3779B97F4A7C15 % 2 ** 64)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+        return (z >> np.uint64(11)) * 2.0 ** -53 < validation_split
+
+    def _iter_encoded_chunks(self, filepath, message_column, label_column, chunk_size,
+                             encoding, validation_split, validation):
+        """
+        Stream encoded training or validation rows from a labelled CSV file.
+
+        Rows are split by _validation_rows(), so every epoch sees the same split.
+
+        Args:
+            filepath (str): Path to the CSV file
+            message_column (str): Column holding the message text
+            label_column (str): Column holding the labels
+            chunk_size (int): Number of rows read per chunk
+            encoding (str): Encoding of the file
+            validation_split (float): Fraction of rows held out for validation
+            validation (bool): Yield the validation rows instead of training rows
+
+        Yields:
+            tuple: (encoded features, int32 labels) per chunk
+        """
+        offset = 0
+        chunks = self._iter_csv_chunks(filepath, message_column, label_column, chunk_size, encoding)
+
+        for texts, labels in chunks:
+            rows = np.arange(offset, offset + len(texts))
+            offset += len(texts)
+
+            mask = self._validation_rows(rows, validation_split) == validation
+            if not mask.any():
+                continue
+
+            yield (
+                self.texts_to_sequences(texts[mask]),
+                self.label_encoder.transform(labels[mask]).astype(np.int32)
+            )
+
+    def train_from_csv(self, filepath, message_column='v2', label_column='v1', chunk_size=100000,
+                       validation_split=0.2, epochs=10, batch_size=32, encoding='latin-1',
+                       shuffle_buffer=10000):
+        """
+        Train on a CSV file too large to load, reading it chunk by chunk.
+
+        A first streaming pass builds the vocabulary and label classes. Each
+        epoch then streams the file again through a tf.data pipeline (or
+        partial_fit calls for the linear engine), so memory is bounded by
+        chunk_size rather than by the size of the corpus. Unlike load_data(),
+        duplicate messages are not removed.
+
+        Args:
+            filepath (str): Path to the CSV file
+            message_column (str): Column holding the message text
+            label_column (str): Column holding the labels
+            chunk_size (int): Number of rows read per chunk
+            validation_split (float): Fraction of rows held out for validation
+            epochs (int): Number of training epochs
+            batch_size (int): Batch size for the neural engine
+            encoding (str): Encoding of the file
+            shuffle_buffer (int): Rows shuffled together by the tf.data pipeline
+
+        Returns:
+            History: Training history
+        """
+        if not 0 <= validation_split < 1:
+            raise ValueError("validation_split must be in [0, 1)")
+
+        # First pass: vocabulary, label classes and the size of each subset
+        labels = set()
+        counts = {'rows': 0, 'validation': 0}
+
+        def cleaned_chunks():
+            chunks = self._iter_csv_chunks(filepath, message_column, label_column, chunk_size, encoding)
+            for texts, chunk_labels in chunks:
+                labels.update(chunk_labels.unique())
+                rows = np.arange(counts['rows'], counts['rows'] + len(texts))
+                counts['validation'] += int(self._validation_rows(rows, validation_split).sum())
+                counts['rows'] += len(texts)
+                yield texts
+
+        if self.engine == 'linear':
+            for _ in cleaned_chunks():
+                pass
+            self.build_tokenizer(None)
+        else:
+            self.tokenizer = VocabularyEncoder(max_words=self.max_words, max_len=self.max_len)
+            self.tokenizer.fit_chunks(cleaned_chunks())
+            print(f"Vocabulary size: {len(self.tokenizer.word_index)}")
+
+        n_train = counts['rows'] - counts['validation']
+        if n_train == 0:
+            raise ValueError(f"No training rows: all {counts['rows']} labelled rows "
+                             f"fell into the {validation_split:.0%} validation split")
+        if validation_split > 0 and counts['validation'] == 0:
+            raise ValueError(f"No validation rows among {counts['rows']} labelled rows; "
+                             "use a larger file, a larger validation_split or validation_split=0")
+        print(f"Streaming {n_train} training and {counts['validation']} validation rows")
+
+        self.label_encoder.fit(np.array(sorted(labels), dtype=object))
+
+        if self.model is None:
+            self.build_model()
+
+        def encoded_chunks(validation):
+            return self._iter_encoded_chunks(
+                filepath, message_column, label_column, chunk_size, encoding,
+                validation_split, validation
+            )
+
+        if self.engine == 'linear':
+            self.history = self._train_linear_stream(encoded_chunks, epochs)
+            return self.history
+
+        # Second pass onwards: stream encoded chunks into fit
+        def make_dataset(validation):
+            dataset = tf.data.Dataset.from_generator(
+                lambda: encoded_chunks(validation),
+                output_signature=(
+                    tf.TensorSpec((None, self.max_len), tf.int32),
+                    tf.TensorSpec((None,), tf.int32)
+                )
+            ).unbatch()
+            if not validation:
+                dataset = dataset.shuffle(shuffle_buffer)
+            return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+        early_stopping = keras.callbacks.EarlyStopping(
+            monitor='val_loss',
+            patience=3,
+            restore_best_weights=True
+        )
+
+        self.history = self.model.fit(
+            make_dataset(validation=False),
+            validation_data=make_dataset(validation=True) if validation_split > 0 else None,
+            epochs=epochs,
+            callbacks=[early_stopping] if validation_split > 0 else [],
+            verbose=1
+        )
+
+        return self.history
+
+    def _train_linear_stream(self, encoded_chunks, epochs):
+        """
+        Train the linear engine with one partial_fit call per streamed chunk.
+
+        Args:
+            encoded_chunks (callable): Returns an iterator of (X, y) chunks,
+                taking True for validation rows and False for training rows
+            epochs (int): Number of passes over the file
+
+        Returns:
+            SimpleNamespace: Object with a Keras-style history dict
+        """
+        classes = np.arange(len(self.label_encoder.classes_))
+        history = {'loss': [], 'accuracy': [], 'val_loss': [], 'val_accuracy': []}
+
+        fitted = False
+        for epoch in range(epochs):
+            for X, y in encoded_chunks(False):
+                self.model.partial_fit(X, y, classes=classes)
+                fitted = True
+
+            # An unfitted model cannot score either subset
+            if not fitted:
+                continue
+
+            # Score both subsets after the epoch, one chunk at a time
+            for prefix, validation in (('', False), ('val_', True)):
+                loss = correct = total = 0
+                for X, y in encoded_chunks(validation):
+                    proba = self.model.predict_proba(X)
+                    loss += log_loss(y, proba, labels=classes) * len(y)
+                    correct += int((proba.argmax(axis=1) == y).sum())
+                    total += len(y)
+                if total:
+                    history[prefix + 'loss'].append(loss / total)
+                    history[prefix + 'accuracy'].append(correct / total)
+
+            print(f"Epoch {epoch + 1}/{epochs} - loss: {history['loss'][-1]:.4f} "
+                  f"- accuracy: {history['accuracy'][-1]:.4f}")
+
+        return SimpleNamespace(history=history)
+
     def evaluate(self, X_test, y_test):
         """
         Evaluate the model on test data.
@@ -239,12 +601,16 @@ class SMSClassifier:
         if self.model is None:
             raise ValueError("Model not trained yet")
 
-        # Get predictions
-        y_pred_prob = self.model.predict(X_test)
-        y_pred = (y_pred_prob > 0.5).astype(int).flatten()
-
-        # Calculate metrics
-        test_loss, test_accuracy = self.model.evaluate(X_test, y_test, verbose=0)
+        # Get predictions and calculate metrics
+        if self.engine == 'linear':
+            y_pred_prob = self.model.predict_proba(X_test)[:, 1]
+            y_pred = (y_pred_prob > 0.5).astype(int)
+            test_loss = log_loss(y_test, y_pred_prob, labels=[0, 1])
+            test_accuracy = accuracy_score(y_test, y_pred)
+        else:
+            y_pred_prob = self.model.predict(X_test)
+            y_pred = (y_pred_prob > 0.5).astype(int).flatten()
+            test_loss, test_accuracy = self.model.evaluate(X_test, y_test, verbose=0)
 
         # Classification report
         class_names = self.label_encoder.classes_
@@ -282,13 +648,144 @@ class SMSClassifier:
         sequence = self.texts_to_sequences([clean_message])
 
         # Make prediction
-        prediction_prob = self.model.predict(sequence)[0][0]
+        if self.engine == 'linear':
+            prediction_prob = self.model.predict_proba(sequence)[0, 1]
+        else:
+            prediction_prob = self.model.predict(sequence)[0][0]
         prediction = 1 if prediction_prob > 0.5 else 0
         confidence = prediction_prob if prediction == 1 else 1 - prediction_prob
 
         class_names = self.label_encoder.classes_
         return class_names[prediction], confidence
 
+    def _get_inference_fn(self):
+        """
+        Get a compiled inference function for padded sequence batches.
+
+        Calling the model directly with training=False avoids the per-call
+        overhead of model.predict().
+
+        Returns:
+            tf.types.experimental.GenericFunction: Function mapping int32
+                sequences to spam probabilities
+        """
+        if self._inference_fn is None:
+            model = self.model
+
+            @tf.function(input_signature=[tf.TensorSpec((None, self.max_len), tf.int32)])
+            def infer(sequences):
+                return model(sequences, training=False)
+
+            self._inference_fn = infer
+
+        return self._inference_fn
+
+    def predict_proba(self, messages, batch_size=8192):
+        """
+        Get the spam probability of many messages.
+
+        Cleaning, tokenising and padding run once over all messages, then the
+        model scores them in batches of batch_size.
+
+        Args:
+            messages: Raw SMS messages (list or pd.Series)
+            batch_size (int): Number of messages per inference call
+
+        Returns:
+            numpy.ndarray: Probability of the positive class per message
+        """
+        if self.model is None:
+            raise ValueError("Model not trained yet")
+
+        sequences = self.texts_to_sequences(self.clean_texts(messages))
+        if self.engine == 'linear':
+            def score(batch):
+                return self.model.predict_proba(batch)[:, 1]
+        else:
+            infer = self._get_inference_fn()
+
+            def score(batch):
+                return infer(batch).numpy().ravel()
+
+        n_messages = sequences.shape[0]
+        probabilities = np.empty(n_messages, dtype=np.float32)
+        for start in range(0, n_messages, batch_size):
+            probabilities[start:start + batch_size] = score(sequences[start:start + batch_size])
+
+        return probabilities
+
+    def predict_batch(self, messages, batch_size=8192):
+        """
+        Predict whether each of many messages is spam or ham.
+
+        Args:
+            messages: Raw SMS messages (list or pd.Series)
+            batch_size (int): Number of messages per inference call
+
+        Returns:
+            list: (prediction, confidence) tuples in input order
+        """
+        probabilities = self.predict_proba(messages, batch_size)
+        predictions = (probabilities > 0.5).astype(int)
+        confidences = np.where(predictions == 1, probabilities, 1 - probabilities)
+
+        class_names = self.label_encoder.classes_
+        return list(zip(class_names[predictions], confidences.tolist()))
+
+    def score_file(self, filepath, output_path, message_column='message',
+                   chunk_size=100000, batch_size=8192, encoding='utf-8'):
+        """
+        Score every message in a CSV file and stream the results to CSV.
+
+        The input is read chunk_size rows at a time and each chunk's results
+        are appended to the output before the next chunk is read, so memory
+        stays flat however large the file is.
+
+        Args:
+            filepath (str): Path to the CSV file containing messages
+            output_path (str): Path of the CSV file to write
+            message_column (str): Column holding the message text
+            chunk_size (int): Number of rows read per chunk
+            batch_size (int): Number of messages per inference call
+            encoding (str): Encoding of the input file
+
+        Returns:
+            dict: Number of messages scored, elapsed seconds and messages/sec
+        """
+        if self.model is None:
+            raise ValueError("Model not trained yet")
+
+        class_names = self.label_encoder.classes_
+        reader = pd.read_csv(
+            filepath,
+            usecols=[message_column],
+            dtype={message_column: str},
+            encoding=encoding,
+            chunksize=chunk_size
+        )
+
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+        start = time.perf_counter()
+        count = 0
+        for chunk in reader:
+            probabilities = self.predict_proba(chunk[message_column], batch_size)
+            predictions = (probabilities > 0.5).astype(int)
+
+            pd.DataFrame({
+                'row': np.arange(count, count + len(chunk)),
+                'prediction': class_names[predictions],
+                'spam_probability': probabilities
+            }).to_csv(output_path, mode='a', header=count == 0, index=False,
+                      float_format='%.6f')
+            count += len(chunk)
+
+            print(f"Scored {count} messages")
+        elapsed = time.perf_counter() - start
+
+        return {'messages': count, 'seconds': elapsed, 'messages_per_sec': count / max(elapsed, 1e-9)}
+
     def save_model(self, filepath):
         """
         Save the trained model.
@@ -298,7 +795,11 @@ class SMSClassifier:
         """
         if self.model is None:
             raise ValueError("No model to save")
-        self.model.save(filepath)
+
+        if self.engine == 'linear':
+            joblib.dump(self.model, filepath)
+        else:
+            self.model.save(filepath)
 
     def load_model(self, filepath):
         """
@@ -307,7 +808,58 @@ class SMSClassifier:
         Args:
             filepath (str): Path to the saved model
         """
-        self.model = keras.models.load_model(filepath)
+        if self.engine == 'linear':
+            self.model = joblib.load(filepath)
+            self.build_tokenizer(None)
+        else:
+            self.model = keras.models.load_model(filepath)
+        self._inference_fn = None
+
+    def save_bundle(self, filepath):
+        """
+        Save the model, vocabulary, label classes and settings as one file.
+
+        Args:
+            filepath (str): Path of the bundle to write
+        """
+        if self.model is None or self.tokenizer is None:
+            raise ValueError("No model to save")
+        if self.engine != 'neural':
+            raise ValueError("Bundles support the neural engine only; use save_model()")
+
+        metadata = {
+            'max_words': self.max_words,
+            'max_len': self.max_len,
+            'oov_token': self.tokenizer.oov_token,
+            'vocabulary': self.tokenizer.vocabulary,
+            'label_classes': self.label_encoder.classes_.tolist()
+        }
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            model_path = os.path.join(tmp_dir, sms_bundle.MODEL_NAME)
+            self.model.save(model_path)
+            sms_bundle.write_bundle(filepath, model_path, metadata)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def load_bundle(self, filepath):
+        """
+        Restore the model, tokenizer and label encoder from a bundle.
+
+        Args:
+            filepath (str): Path of the bundle
+        """
+        metadata = sms_bundle.read_metadata(filepath)
+
+        self.max_words = metadata['max_words']
+        self.max_len = metadata['max_len']
+        self.tokenizer = VocabularyEncoder.from_vocabulary(
+            metadata['vocabulary'], self.max_words, self.max_len, metadata['oov_token']
+        )
+        self.label_encoder.classes_ = np.array(metadata['label_classes'], dtype=object)
+        self.model = sms_bundle.load_bundle_model(filepath)
+        self._inference_fn = None
 
     def plot_training_history(self):
         """
@@ -338,15 +890,87 @@ class SMSClassifier:
         return fig
 
 
+def benchmark_engines(df, epochs=10, n_score=100000):
+    """
+    Train both engines on the same split and compare them.
+
+    Args:
+        df (pd.DataFrame): Dataframe returned by SMSClassifier.load_data()
+        epochs (int): Number of training epochs per engine
+        n_score (int): Number of messages scored for the throughput figure
+
+    Returns:
+        dict: Per engine, test accuracy, training seconds, messages/sec and
+            model parameter bytes
+    """
+    train_df, test_df = train_test_split(
+        df, test_size=0.2, random_state=42, stratify=df['label_encoded']
+    )
+    repeats = -(-n_score // len(test_df))
+    score_messages = pd.concat([test_df['message']] * repeats).iloc[:n_score]
+
+    results = {}
+    for engine in SMSClassifier.ENGINES:
+        classifier = SMSClassifier(engine=engine)
+        classifier.label_encoder.fit(df['label'])
+
+        start = time.perf_counter()
+        classifier.build_tokenizer(train_df['clean_message'])
+        X_train = classifier.texts_to_sequences(train_df['clean_message'])
+        classifier.build_model()
+        classifier.train(X_train, train_df['label_encoded'].values, epochs=epochs)
+        train_time = time.perf_counter() - start
+
+        X_test = classifier.texts_to_sequences(test_df['clean_message'])
+        evaluation = classifier.evaluate(X_test, test_df['label_encoded'].values)
+
+        classifier.predict_proba(score_messages.iloc[:1000])
+        start = time.perf_counter()
+        classifier.predict_proba(score_messages)
+        score_time = time.perf_counter() - start
+
+        if engine == 'linear':
+            model_bytes = classifier.model.coef_.nbytes + classifier.model.intercept_.nbytes
+        else:
+            model_bytes = sum(weights.nbytes for weights in classifier.model.get_weights())
+
+        results[engine] = {
+            'accuracy': float(evaluation['test_accuracy']),
+            'train_seconds': train_time,
+            'messages_per_sec': len(score_messages) / score_time,
+            'model_bytes': model_bytes
+        }
+
+    return results
+
+
 def main():
     """
     Example usage of the SMSClassifier.
     """
+    parser = argparse.ArgumentParser(description='Neural Network SMS Text Classifier')
+    parser.add_argument('--engine', choices=SMSClassifier.ENGINES, default='neural',
+                        help='Model engine to train (default: neural)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Compare accuracy, training time, throughput and size of both engines')
+
+    args = parser.parse_args()
+
     print("Neural Network SMS Text Classifier")
     print("=" * 50)
 
+    if args.benchmark:
+        df = SMSClassifier().load_data('spam.csv')
+        results = benchmark_engines(df)
+
+        print(f"\n{'Engine':<8} {'Accuracy':>9} {'Train (s)':>10} {'Msgs/sec':>11} {'Model (KB)':>11}")
+        for engine, stats in results.items():
+            print(f"{engine:<8} {stats['accuracy']:>9.4f} {stats['train_seconds']:>10.2f} "
+                  f"{stats['messages_per_sec']:>11.0f} {stats['model_bytes'] / 1024:>11.1f}")
+        return
+
     # Initialize classifier
-    classifier = SMSClassifier(max_words=5000, max_len=100)
+    classifier = SMSClassifier(max_words=5000, max_len=100, engine=args.engine)
 
     # Load data
     df = classifier.load_data('spam.csv')
@@ -362,7 +986,8 @@ def main():
     y = df['label_encoded'].values
 
     print(f"\nFeature matrix shape: {X.shape}")
-    print(f"Vocabulary size: {len(classifier.tokenizer.word_index)}")
+    if args.engine == 'neural':
+        print(f"Vocabulary size: {len(classifier.tokenizer.word_index)}")
 
     # Split the data
     X_train, X_test, y_train, y_test = train_test_split(
@@ -378,8 +1003,7 @@ def main():
     print("\nEvaluating the model...")
     results = classifier.evaluate(X_test, y_test)
 
-    print("
-Test Results:")
+    print("\nTest Results:")
     print(f"Test Accuracy: {results['test_accuracy']:.4f}")
     print("\nClassification Report:")
     print(results['classification_report'])
@@ -394,8 +1018,8 @@ Test Results:")
         "Thanks for the help yesterday"
     ]
 
-    for msg in test_messages:
-        prediction, confidence = classifier.predict(msg)
+    predictions = classifier.predict_batch(test_messages)
+    for msg, (prediction, confidence) in zip(test_messages, predictions):
         print(f"Message: {msg[:60]}...")
         print(f"Prediction: {prediction} (confidence: {confidence:.3f})")
 
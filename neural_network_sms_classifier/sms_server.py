@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Neural Network SMS Text Classifier - Micro-batching Server
+This script serves a model bundle over HTTP with asyncio. Incoming messages
+are queued and scored together in micro-batches, and a built-in load
+generator measures throughput and latency.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from sms_bundle import SMSBundle
+
+
+class RollingStats:
+    """
+    Keeps the most recent samples of a metric and reports percentiles.
+    """
+
+    def __init__(self, window=10000):
+        """
+        Initialize the statistics.
+
+        Args:
+            window (int): Number of most recent samples kept
+        """
+        self._samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, value):
+        """
+        Record one sample.
+
+        Args:
+            value (float): Sample value
+        """
+        self._samples.append(value)
+        self.count += 1
+
+    def summary(self, scale=1.0):
+        """
+        Get the mean and percentiles over the sample window.
+
+        Args:
+            scale (float): Factor applied to every value, e.g. 1000 for ms
+
+        Returns:
+            dict: Sample count, mean, p50, p95 and p99
+        """
+        if not self._samples:
+            return {'count': self.count, 'mean': None, 'p50': None, 'p95': None, 'p99': None}
+
+        samples = np.array(self._samples) * scale
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        return {'count': self.count, 'mean': float(samples.mean()),
+                'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
+
+
+class MicroBatcher:
+    """
+    Queues messages and scores them in batches of up to max_batch_size,
+    waiting at most max_wait_ms after the first queued message.
+    """
+
+    def __init__(self, classifier, max_batch_size=256, max_wait_ms=5.0):
+        """
+        Initialize the batcher.
+
+        Args:
+            classifier: Object with a predict_batch(messages) method, such as
+                SMSBundle or SMSClassifier
+            max_batch_size (int): Largest number of messages scored together
+            max_wait_ms (float): Longest time a message waits for a batch to fill
+        """
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batch_sizes = RollingStats()
+        self.latency = RollingStats()
+        self.inference_time = RollingStats()
+        self.max_queue_depth = 0
+        self._task = None
+        # Messages taken off the queue but not answered yet
+        self._batch = []
+
+    def start(self):
+        """
+        Start the background task that flushes batches.
+        """
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the flushing task and fail every message still waiting for a result.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        pending = self._batch
+        self._batch = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+
+        for _, future, _ in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Server is shutting down"))
+
+    async def classify(self, message):
+        """
+        Queue a message and wait for its batch to be scored.
+
+        Args:
+            message (str): SMS message to classify
+
+        Returns:
+            tuple: (prediction, confidence)
+        """
+        if self._task is None:
+            raise RuntimeError("Batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((message, future, time.perf_counter()))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return await future
+
+    async def _next_batch(self):
+        """
+        Wait for a message, then collect more until the batch is full or the
+        time window closes.
+
+        Returns:
+            list: (message, future, enqueued_at) tuples
+        """
+        # Collected in self._batch so stop() can fail them if cancelled midway
+        self._batch = batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        """
+        Flush batches forever, one batched inference per flush.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._next_batch()
+            messages = [message for message, _, _ in batch]
+
+            # Score off the event loop so new requests keep queueing meanwhile
+            start = time.perf_counter()
+            try:
+                predictions = await loop.run_in_executor(None, self.classifier.predict_batch, messages)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finished = time.perf_counter()
+
+            self.inference_time.record(finished - start)
+            self.batch_sizes.record(len(batch))
+
+            for (_, future, enqueued_at), (prediction, confidence) in zip(batch, predictions):
+                self.latency.record(finished - enqueued_at)
+                if not future.done():
+                    future.set_result((str(prediction), float(confidence)))
+            self._batch = []
+
+    def metrics(self):
+        """
+        Get queue, batch and latency metrics.
+
+        Returns:
+            dict: Queue depth, batch size, inference time and request latency
+        """
+        return {
+            'queue_depth': self.queue.qsize(),
+            'max_queue_depth': self.max_queue_depth,
+            'batch_size': self.batch_sizes.summary(),
+            'inference_ms': self.inference_time.summary(1000),
+            'latency_ms': self.latency.summary(1000)
+        }
+
+
+class SMSServer:
+    """
+    Minimal HTTP/1.1 server exposing POST /classify, GET /metrics and GET /health.
+    """
+
+    def __init__(self, batcher):
+        """
+        Initialize the server.
+
+        Args:
+            batcher (MicroBatcher): Batcher scoring the messages
+        """
+        self.batcher = batcher
+        self.started_at = time.time()
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=8001):
+        """
+        Start listening and flushing batches.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind
+        """
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+
+    async def stop(self):
+        """
+        Stop listening and flushing batches.
+        """
+        self._server.close()
+        await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def serve_forever(self):
+        """
+        Serve until cancelled.
+        """
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Serve requests on one keep-alive connection.
+
+        Args:
+            reader (asyncio.StreamReader): Connection reader
+            writer (asyncio.StreamWriter): Connection writer
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                try:
+                    status, payload = await self._route(method, path, body)
+                except Exception as e:
+                    status, payload = 500, {'error': f"Classification failed: {e}"}
+                self._write_json(writer, status, payload)
+                await writer.drain()
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _route(self, method, path, body):
+        """
+        Route a request.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+            body (bytes): Request body
+
+        Returns:
+            tuple: (status code, JSON-serialisable payload)
+        """
+        if method == 'POST' and path == '/classify':
+            try:
+                message = json.loads(body)['message']
+            except (ValueError, KeyError, TypeError):
+                return 400, {'error': "Body must be JSON with a 'message' field"}
+
+            prediction, confidence = await self.batcher.classify(str(message))
+            return 200, {'prediction': prediction, 'confidence': confidence}
+
+        if method == 'GET' and path == '/metrics':
+            return 200, dict(self.batcher.metrics(), uptime_seconds=time.time() - self.started_at)
+
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+
+        return 404, {'error': 'Not found'}
+
+    def _write_json(self, writer, status, payload):
+        """
+        Write a JSON response.
+
+        Args:
+            writer (asyncio.StreamWriter): Connection writer
+            status (int): HTTP status code
+            payload (dict): Response body
+        """
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {reasons[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+        )
+
+
+async def generate_load(host, port, messages, n_requests=5000, concurrency=64):
+    """
+    Send classify requests over concurrent keep-alive connections.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        messages (list): Messages sent in rotation
+        n_requests (int): Total number of requests
+        concurrency (int): Number of connections sending in parallel
+
+    Returns:
+        dict: Requests/sec and client-side latency percentiles in milliseconds
+    """
+    latencies = RollingStats(window=n_requests)
+    counter = iter(range(n_requests))
+
+    async def worker():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for i in counter:
+                body = json.dumps({'message': messages[i % len(messages)]}).encode('utf-8')
+                start = time.perf_counter()
+                writer.write(
+                    f"POST /classify HTTP/1.1\r\nHost: {host}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+                )
+                await writer.drain()
+
+                await reader.readline()
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    if name.strip().lower() == 'content-length':
+                        length = int(value)
+                await reader.readexactly(length)
+                latencies.record(time.perf_counter() - start)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return dict(latencies.summary(1000), requests_per_sec=n_requests / elapsed)
+
+
+async def load_test(classifier, messages, n_requests=5000, concurrency=64,
+                    max_batch_size=256, max_wait_ms=5.0, port=8001):
+    """
+    Run the server in-process and measure it with the load generator.
+
+    Args:
+        classifier: Object with a predict_batch(messages) method
+        messages (list): Messages sent in rotation
+        n_requests (int): Total number of requests
+        concurrency (int): Number of connections sending in parallel
+        max_batch_size (int): Largest micro-batch
+        max_wait_ms (float): Longest wait for a micro-batch to fill
+        port (int): Local port to bind
+
+    Returns:
+        dict: Client statistics and server metrics
+    """
+    server = SMSServer(MicroBatcher(classifier, max_batch_size, max_wait_ms))
+    await server.start('127.0.0.1', port)
+    try:
+        client = await generate_load('127.0.0.1', port, messages, n_requests, concurrency)
+    finally:
+        metrics = server.batcher.metrics()
+        await server.stop()
+
+    return {'client': client, 'server': metrics}
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='SMS Classifier Micro-batching Server')
+    parser.add_argument('--bundle', required=True,
+                        help='Path to a bundle written by SMSClassifier.save_bundle()')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8001,
+                        help='Port to bind (default: 8001)')
+    parser.add_argument('--max-batch-size', type=int, default=256,
+                        help='Largest number of messages scored together (default: 256)')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help='Longest wait for a batch to fill in ms (default: 5)')
+    parser.add_argument('--load-test', action='store_true',
+                        help='Benchmark an in-process server instead of serving')
+    parser.add_argument('--requests', type=int, default=5000,
+                        help='Requests sent by --load-test (default: 5000)')
+    parser.add_argument('--concurrency', type=int, default=64,
+                        help='Parallel connections used by --load-test (default: 64)')
+
+    args = parser.parse_args()
+
+    # Load the bundle and warm the model up before taking traffic
+    bundle = SMSBundle(args.bundle)
+    bundle.predict_batch(['warm up'])
+
+    if args.load_test:
+        messages = [
+            "Hey, how are you doing today?",
+            "WINNER! Claim your FREE prize now!",
+            "Meeting at 3 PM tomorrow",
+            "URGENT: Your account has been suspended",
+            "Thanks for the help yesterday"
+        ]
+
+        # Batch size 1 is the per-message baseline
+        for max_batch_size in (1, args.max_batch_size):
+            results = asyncio.run(load_test(
+                bundle, messages, args.requests, args.concurrency,
+                max_batch_size, args.max_wait_ms, args.port
+            ))
+            client, server = results['client'], results['server']
+            print(f"max_batch_size={max_batch_size}: {client['requests_per_sec']:.0f} req/s, "
+                  f"p50 {client['p50']:.1f}ms, p99 {client['p99']:.1f}ms, "
+                  f"mean batch {server['batch_size']['mean']:.1f}, "
+                  f"max queue depth {server['max_queue_depth']}")
+        return
+
+    async def serve():
+        server = SMSServer(MicroBatcher(bundle, args.max_batch_size, args.max_wait_ms))
+        await server.start(args.host, args.port)
+        print(f"Serving on http://{args.host}:{args.port}")
+        print("Endpoints: POST /classify {\"message\": ...}, GET /metrics, GET /health")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\nShutting down")
+
+
+if __name__ == '__main__':
+    main()
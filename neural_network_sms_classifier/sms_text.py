@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Neural Network SMS Text Classifier - Text Preprocessing
+This script holds the text cleaning and vocabulary encoding shared by the
+classifier and its serving runtime. It does not import TensorFlow.
+"""
+
+import re
+import string
+from collections import Counter
+from itertools import chain, repeat
+
+import numpy as np
+import pandas as pd
+
+
+# Patterns shared by the scalar and vectorised text cleaners
+NON_LETTER_PATTERN = re.compile(r'[^a-zA-Z\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Saved with model bundles so a loader can check it cleans text the same way
+CLEANING_CONFIG = {
+    'lowercase': True,
+    'remove_pattern': NON_LETTER_PATTERN.pattern,
+    'collapse_whitespace': True
+}
+
+# Byte tables for the single-pass cleaner: ASCII whitespace becomes a space,
+# uppercase ASCII becomes lowercase, and every other byte except letters and
+# the NUL message separator is deleted, including all non-ASCII bytes
+_ASCII_WHITESPACE = bytes(i for i in range(128) if chr(i).isspace())
+_CLEAN_TABLE = bytes.maketrans(
+    _ASCII_WHITESPACE + string.ascii_uppercase.encode('ascii'),
+    b' ' * len(_ASCII_WHITESPACE) + string.ascii_lowercase.encode('ascii')
+)
+_DELETE_BYTES = bytes(
+    i for i in range(256)
+    if not (i < 128 and (chr(i).isalpha() or chr(i).isspace() or i == 0))
+)
+
+# UTF-8 sequences the regex cleaner does not simply drop: Unicode whitespace
+# still splits words, and two characters lowercase to an ASCII letter. Each
+# pattern starts with a literal lead byte so the regex engine can skip ahead.
+# test_sms_text.py rebuilds this list from the Unicode database and checks it.
+_UNICODE_REPLACEMENTS = [
+    (re.compile(rb'\xc2[\x85\xa0]'), b' '),
+    (re.compile(rb'\xe1\x9a\x80'), b' '),
+    (re.compile(rb'\xe2(?:\x80[\x80-\x8a\xa8\xa9\xaf]|\x81\x9f)'), b' '),
+    (re.compile(rb'\xe3\x80\x80'), b' '),
+    (re.compile(rb'\xc4\xb0'), b'i'),
+    (re.compile(rb'\xe2\x84\xaa'), b'k'),
+]
+
+# RE2 character class of every character str.split() treats as whitespace
+UNICODE_WHITESPACE_CLASS = (
+    r'[\t\n\x0b\x0c\r\x1c-\x1f \x{85}\x{a0}\x{1680}\x{2000}-\x{200a}'
+    r'\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]'
+)
+
+
+def clean_text_series(texts):
+    """
+    Vectorised equivalent of SMSClassifier._clean_text over a whole column.
+
+    Lowercases, removes everything but letters and whitespace, and collapses
+    whitespace runs to single spaces, giving exactly the same output as
+    applying _clean_text to each message. The messages are joined into one
+    NUL-separated UTF-8 buffer and cleaned with bytes and numpy operations
+    instead of one regex call per message.
+
+    Args:
+        texts (pd.Series): Raw messages
+
+    Returns:
+        pd.Series: Cleaned messages
+    """
+    texts = texts.fillna('').astype(str)
+    buffer = '\x00'.join(texts.tolist()).encode('utf-8')
+
+    if not buffer.isascii():
+        for pattern, replacement in _UNICODE_REPLACEMENTS:
+            buffer = pattern.sub(replacement, buffer)
+
+    # Lowercase, map whitespace to spaces and drop everything else
+    chars = np.frombuffer(buffer.translate(_CLEAN_TABLE, _DELETE_BYTES), dtype=np.uint8)
+
+    # Keep a space only when a letter follows it, which collapses runs and
+    # drops trailing spaces; leading spaces are stripped after the join
+    keep = chars != ord(' ')
+    keep[:-1] |= chars[1:] >= ord('a')
+    buffer = chars[keep].tobytes().lstrip(b' ').replace(b'\x00 ', b'\x00')
+    cleaned = buffer.decode('ascii').split('\x00')
+
+    # A message containing NUL itself would shift the split, so fall back
+    if len(cleaned) != len(texts):
+        return (
+            texts.str.lower()
+            .str.replace(NON_LETTER_PATTERN, '', regex=True)
+            .str.replace(WHITESPACE_PATTERN, ' ', regex=True)
+            .str.strip()
+        )
+
+    return pd.Series(cleaned, index=texts.index, dtype=object)
+
+
+def _clean_text_chunk(texts):
+    """
+    Clean a list of messages in a worker process.
+
+    Args:
+        texts (list): Raw messages
+
+    Returns:
+        list: Cleaned messages
+    """
+    return clean_text_series(pd.Series(texts, dtype=object)).tolist()
+
+
+def clean_text_tensor(texts):
+    """
+    In-graph version of SMSClassifier._clean_text for string tensors.
+
+    Used as the standardize step of the exported TextVectorization layer;
+    whitespace is normalised to single spaces and everything but ASCII
+    letters is dropped, matching clean_text_series. TensorFlow is imported
+    on first use so this module stays importable without it.
+
+    Args:
+        texts (tf.Tensor): String tensor of raw messages
+
+    Returns:
+        tf.Tensor: String tensor of cleaned messages
+    """
+    import tensorflow as tf
+
+    texts = tf.strings.regex_replace(texts, '\u0130', 'i')
+    texts = tf.strings.regex_replace(texts, '\u212a', 'k')
+    texts = tf.strings.lower(texts, encoding='utf-8')
+    texts = tf.strings.regex_replace(texts, UNICODE_WHITESPACE_CLASS, ' ')
+    texts = tf.strings.regex_replace(texts, '[^a-z ]', '')
+    return tf.strings.strip(tf.strings.regex_replace(texts, ' +', ' '))
+
+
+class VocabularyEncoder:
+    """
+    Word-index encoder equivalent to the Keras Tokenizer with an OOV token.
+
+    Index 0 is padding, index 1 the OOV token and words follow by descending
+    frequency (ties in order of first appearance). Words ranked at or beyond
+    max_words encode as OOV, exactly like Tokenizer(num_words=max_words,
+    oov_token='<OOV>') followed by post padding and truncation.
+    """
+
+    def __init__(self, max_words=5000, max_len=100, oov_token='<OOV>'):
+        """
+        Initialize the encoder.
+
+        Args:
+            max_words (int): Maximum number of word indices, including
+                padding and OOV
+            max_len (int): Length of the encoded sequences
+            oov_token (str): Token standing for out-of-vocabulary words
+        """
+        self.max_words = max_words
+        self.max_len = max_len
+        self.oov_token = oov_token
+        self.word_counts = Counter()
+        self.word_index = {}
+        self._encoded_index = {}
+
+    def fit(self, texts):
+        """
+        Count words in a single pass and assign their indices.
+
+        Args:
+            texts: Cleaned messages with whitespace-separated words
+
+        Returns:
+            VocabularyEncoder: The fitted encoder
+        """
+        return self.fit_chunks([texts])
+
+    def fit_chunks(self, chunks):
+        """
+        Count words over an iterable of text chunks, then assign indices.
+
+        Only the running word counts are kept between chunks, so the chunks
+        can be streamed from a file far larger than memory.
+
+        Args:
+            chunks: Iterable of collections of cleaned messages
+
+        Returns:
+            VocabularyEncoder: The fitted encoder
+        """
+        self.word_counts = Counter()
+        for texts in chunks:
+            self.word_counts.update(chain.from_iterable(text.split() for text in texts))
+
+        words = [word for word, _ in self.word_counts.most_common()]
+        self._set_words(words)
+        return self
+
+    @classmethod
+    def from_vocabulary(cls, vocabulary, max_words, max_len, oov_token='<OOV>'):
+        """
+        Rebuild a fitted encoder from its saved vocabulary.
+
+        Args:
+            vocabulary (list): Words ordered by index, as returned by the
+                vocabulary property
+            max_words (int): Maximum number of word indices
+            max_len (int): Length of the encoded sequences
+            oov_token (str): Token standing for out-of-vocabulary words
+
+        Returns:
+            VocabularyEncoder: Encoder producing the same sequences
+        """
+        encoder = cls(max_words=max_words, max_len=max_len, oov_token=oov_token)
+        encoder._set_words(list(vocabulary))
+        return encoder
+
+    def _set_words(self, words):
+        """
+        Assign indices to words ordered from most to least frequent.
+
+        Args:
+            words (list): Vocabulary without padding and OOV entries
+        """
+        self.word_index = {self.oov_token: 1}
+        self.word_index.update((word, i) for i, word in enumerate(words, start=2))
+
+        # Only words ranked below max_words keep their index; the rest are OOV
+        self._encoded_index = {
+            word: i for word, i in self.word_index.items() if 2 <= i < self.max_words
+        }
+
+    @property
+    def vocabulary(self):
+        """
+        Words that get their own index, ordered by index from 2 upwards.
+
+        Returns:
+            list: Words encoded to indices below max_words
+        """
+        return list(self._encoded_index)
+
+    def transform(self, texts):
+        """
+        Encode texts into a padded int32 index matrix.
+
+        Args:
+            texts: Cleaned messages with whitespace-separated words
+
+        Returns:
+            numpy.ndarray: int32 array of shape (n, max_len)
+        """
+        # Words past max_len are truncated, so never split beyond it
+        split_texts = [text.split(None, self.max_len)[:self.max_len] for text in texts]
+        lengths = np.fromiter(map(len, split_texts), dtype=np.int64, count=len(split_texts))
+        sequences = np.zeros((len(split_texts), self.max_len), dtype=np.int32)
+
+        total = int(lengths.sum())
+        if total == 0:
+            return sequences
+
+        # Look every token up in one pass; unknown and rare words become OOV
+        tokens = chain.from_iterable(split_texts)
+        ids = np.fromiter(map(self._encoded_index.get, tokens, repeat(1)), dtype=np.int32, count=total)
+
+        # Place each token at its row and column
+        rows = np.repeat(np.arange(len(split_texts)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        columns = np.arange(total) - np.repeat(starts, lengths)
+        sequences[rows, columns] = ids
+
+        return sequences
+
+    def to_text_vectorization(self):
+        """
+        Build a TextVectorization layer giving the same indices in-graph.
+
+        The layer takes raw strings; clean_text_tensor performs the cleaning
+        that clean_text_series does outside the graph.
+
+        Returns:
+            keras.layers.TextVectorization: Configured, vocabulary-loaded layer
+        """
+        from tensorflow.keras import layers, utils
+
+        standardize = utils.register_keras_serializable(package='sms_classifier')(clean_text_tensor)
+
+        return layers.TextVectorization(
+            standardize=standardize,
+            split='whitespace',
+            output_mode='int',
+            output_sequence_length=self.max_len,
+            vocabulary=self.vocabulary
+        )
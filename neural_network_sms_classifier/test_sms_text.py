@@ -0,0 +1,99 @@
+"""
+Tests that the byte-table text cleaner matches the regex cleaner.
+
+Run with: python -m pytest test_sms_text.py
+"""
+
+import re
+import sys
+import unicodedata
+
+import pandas as pd
+
+from sms_text import (
+    NON_LETTER_PATTERN, UNICODE_WHITESPACE_CLASS, _CLEAN_TABLE, _DELETE_BYTES,
+    _UNICODE_REPLACEMENTS, clean_text_series
+)
+
+
+def _clean_text(text):
+    """
+    Reference cleaner, the same steps as SMSClassifier._clean_text.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Cleaned text
+    """
+    return ' '.join(NON_LETTER_PATTERN.sub('', text.lower()).split())
+
+
+def _non_ascii_characters():
+    """
+    Every non-ASCII character that can be encoded as UTF-8.
+
+    Returns:
+        list: Characters from U+0080 up, without surrogates
+    """
+    return [
+        char for char in map(chr, range(0x80, sys.maxunicode + 1))
+        if unicodedata.category(char) != 'Cs'
+    ]
+
+
+def test_unicode_replacements_match_unicode_data():
+    # What the regex cleaner makes of each character on its own: whitespace
+    # splits words, and a few characters lowercase to ASCII letters
+    expected = {}
+    for char in _non_ascii_characters():
+        if char.isspace():
+            expected[char] = b' '
+        else:
+            letters = re.sub('[^a-z]', '', char.lower())
+            if letters:
+                expected[char] = letters.encode('ascii')
+
+    actual = {}
+    for char in _non_ascii_characters():
+        data = char.encode('utf-8')
+        for pattern, replacement in _UNICODE_REPLACEMENTS:
+            data = pattern.sub(replacement, data)
+        data = data.translate(_CLEAN_TABLE, _DELETE_BYTES)
+        if data:
+            actual[char] = data
+
+    assert actual == expected, f"Unicode {unicodedata.unidata_version} differs from the cleaning table"
+
+
+def test_whitespace_class_matches_unicode_data():
+    # Translate the RE2 \x{...} escapes to Python's \U escapes
+    pattern = re.compile(re.sub(r'\\x\{([0-9a-f]+)\}',
+                                lambda m: '\\U' + m.group(1).zfill(8), UNICODE_WHITESPACE_CLASS))
+
+    matched = {char for char in map(chr, range(sys.maxunicode + 1)) if pattern.fullmatch(char)}
+    whitespace = {char for char in map(chr, range(sys.maxunicode + 1)) if char.isspace()}
+
+    assert matched == whitespace
+
+
+def test_clean_text_series_matches_scalar_cleaner():
+    messages = [
+        'FREE entry!! Call 0800-123 now',
+        '  leading\tand\ntrailing  ',
+        'caf\u00e9 na\u00efve \u0130stanbul \u212aelvin',
+        'no\u00a0break\u2003em\u3000ideographic',
+        '',
+        None,
+        '1234 !!!',
+    ]
+
+    expected = [_clean_text(text or '') for text in messages]
+
+    assert clean_text_series(pd.Series(messages)).tolist() == expected
+
+
+def test_clean_text_series_with_nul_in_message():
+    texts = pd.Series(['one\x00two', 'Three FOUR'])
+
+    assert clean_text_series(texts).tolist() == [_clean_text(text) for text in texts]